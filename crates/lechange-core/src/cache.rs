@@ -0,0 +1,134 @@
+//! Bounded least-recently-used cache for long-lived callers
+//!
+//! Used by embedders (e.g. the Python bindings) that keep a detector alive
+//! across many calls and want to reuse expensive intermediate results.
+
+use parking_lot::Mutex;
+use std::borrow::Borrow;
+use std::collections::HashMap;
+use std::hash::Hash;
+
+/// Thread-safe LRU cache with a fixed capacity.
+///
+/// Values are cloned out on lookup, so `V` should be cheap to clone
+/// (typically an `Arc`). Each entry carries a unique use tick; eviction scans
+/// for the oldest tick, which is O(capacity) but only happens on insert when
+/// the cache is full.
+pub struct LruCache<K, V> {
+    capacity: usize,
+    inner: Mutex<LruInner<K, V>>,
+}
+
+struct LruInner<K, V> {
+    map: HashMap<K, (V, u64)>,
+    tick: u64,
+}
+
+impl<K: Eq + Hash, V: Clone> LruCache<K, V> {
+    /// Create a cache holding at most `capacity` entries (minimum 1)
+    pub fn new(capacity: usize) -> Self {
+        let capacity = capacity.max(1);
+        Self {
+            capacity,
+            inner: Mutex::new(LruInner {
+                map: HashMap::with_capacity(capacity),
+                tick: 0,
+            }),
+        }
+    }
+
+    /// Look up a value, marking it as most recently used
+    pub fn get<Q>(&self, key: &Q) -> Option<V>
+    where
+        K: Borrow<Q>,
+        Q: Hash + Eq + ?Sized,
+    {
+        let mut inner = self.inner.lock();
+        inner.tick += 1;
+        let tick = inner.tick;
+        inner.map.get_mut(key).map(|(value, used)| {
+            *used = tick;
+            value.clone()
+        })
+    }
+
+    /// Insert a value, evicting the least recently used entry if full
+    pub fn insert(&self, key: K, value: V) {
+        let mut inner = self.inner.lock();
+        inner.tick += 1;
+        let tick = inner.tick;
+
+        if inner.map.len() >= self.capacity && !inner.map.contains_key(&key) {
+            // Ticks are unique, so this removes exactly one entry
+            if let Some(oldest) = inner.map.values().map(|(_, used)| *used).min() {
+                inner.map.retain(|_, (_, used)| *used != oldest);
+            }
+        }
+
+        inner.map.insert(key, (value, tick));
+    }
+
+    /// Number of cached entries
+    pub fn len(&self) -> usize {
+        self.inner.lock().map.len()
+    }
+
+    /// Whether the cache is empty
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+
+    /// Drop every cached entry
+    pub fn clear(&self) {
+        self.inner.lock().map.clear();
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_get_and_insert() {
+        let cache = LruCache::new(2);
+        assert!(cache.get("a").is_none());
+        cache.insert("a".to_string(), 1);
+        assert_eq!(cache.get("a"), Some(1));
+        assert_eq!(cache.len(), 1);
+    }
+
+    #[test]
+    fn test_evicts_least_recently_used() {
+        let cache = LruCache::new(2);
+        cache.insert("a".to_string(), 1);
+        cache.insert("b".to_string(), 2);
+        // Touch "a" so "b" becomes the eviction candidate
+        assert_eq!(cache.get("a"), Some(1));
+        cache.insert("c".to_string(), 3);
+
+        assert_eq!(cache.len(), 2);
+        assert_eq!(cache.get("a"), Some(1));
+        assert!(cache.get("b").is_none());
+        assert_eq!(cache.get("c"), Some(3));
+    }
+
+    #[test]
+    fn test_replace_existing_key_does_not_evict() {
+        let cache = LruCache::new(2);
+        cache.insert("a".to_string(), 1);
+        cache.insert("b".to_string(), 2);
+        cache.insert("a".to_string(), 10);
+
+        assert_eq!(cache.len(), 2);
+        assert_eq!(cache.get("a"), Some(10));
+        assert_eq!(cache.get("b"), Some(2));
+    }
+
+    #[test]
+    fn test_clear() {
+        let cache = LruCache::new(4);
+        cache.insert(1u32, "x");
+        cache.clear();
+        assert!(cache.is_empty());
+    }
+}
@@ -4,24 +4,29 @@ use crate::coordination::ci_decision::CiDecisionEngine;
 use crate::coordination::{extract_owner_repo, WorkflowTracker};
 use crate::error::Result;
 use crate::file_ops::FileOps;
-use crate::git::{GitRepository, ShaResolver, SubmoduleProcessor};
+use crate::git::{DiffCache, GitRepository, ShaResolver, SubmoduleProcessor};
 use crate::http::{GitHubApiClient, WorkflowApiClient};
 use crate::interner::StringInterner;
+use crate::output::writer::{OutputFile, OutputFormat, OutputWriter};
 use crate::patterns::loader::{PatternGroup, PatternLoader};
 use crate::patterns::matcher::PatternMatcher;
 use crate::traits::AsyncGitOps;
 use crate::types::{
-    Diagnostic, DiagnosticCategory, DiagnosticSeverity, GroupResult, InputConfig, ProcessedResult,
-    WorkflowCheckResult,
+    Diagnostic, DiagnosticCategory, DiagnosticSeverity, DiffResult, GroupResult, InputConfig,
+    ProcessedResult, WorkflowCheckResult,
 };
 use rayon::prelude::*;
+use std::borrow::Cow;
 use std::path::Path;
+use std::sync::Arc;
 
 /// File processor that orchestrates the entire detection pipeline
 pub struct FileProcessor<'a> {
     git_ops: &'a GitRepository,
     interner: &'a StringInterner,
     config: &'a InputConfig<'a>,
+    diff_cache: Option<&'a DiffCache>,
+    pattern_matcher: Option<&'a PatternMatcher>,
 }
 
 impl<'a> FileProcessor<'a> {
@@ -35,9 +40,29 @@ impl<'a> FileProcessor<'a> {
             git_ops,
             interner,
             config,
+            diff_cache: None,
+            pattern_matcher: None,
         }
     }
 
+    /// Reuse raw diffs from `cache` for repeated (base, head) pairs
+    ///
+    /// The cache must have been populated with the same interner.
+    pub fn with_diff_cache(mut self, cache: &'a DiffCache) -> Self {
+        self.diff_cache = Some(cache);
+        self
+    }
+
+    /// Use an already compiled matcher instead of building one from the config
+    ///
+    /// The matcher must be equivalent to what the config's pattern sources
+    /// would produce; callers typically compile inline patterns once and reuse
+    /// the result across runs.
+    pub fn with_pattern_matcher(mut self, matcher: &'a PatternMatcher) -> Self {
+        self.pattern_matcher = Some(matcher);
+        self
+    }
+
     /// Main processing pipeline — returns ProcessedResult with index-based partitioning
     pub async fn process(&self) -> Result<ProcessedResult> {
         let mut result = ProcessedResult::default();
@@ -63,16 +88,7 @@ impl<'a> FileProcessor<'a> {
         }
 
         // Step 3: Compute diff (with soft-fail support)
-        let diff = match self
-            .git_ops
-            .diff(
-                &base_sha,
-                &head_sha,
-                self.interner,
-                &self.config.diff_filter,
-            )
-            .await
-        {
+        let diff = match self.compute_diff(&base_sha, &head_sha).await {
             Ok(diff) => diff,
             Err(e) => {
                 if self.config.fail_on_initial_diff_error {
@@ -261,69 +277,140 @@ impl<'a> FileProcessor<'a> {
                     Some(self.interner),
                 );
 
-                // Write filtered files list
-                let filtered_paths: Vec<&str> = result
-                    .filtered_indices
-                    .iter()
-                    .filter_map(|&i| self.interner.resolve(result.all_files[i as usize].path))
-                    .collect();
-                if let Err(e) = crate::output::writer::OutputWriter::write_text(
-                    dir,
-                    "all_changed_files",
-                    &filtered_paths,
-                    &self.config.files_separator,
-                ) {
-                    result.diagnostics.push(Diagnostic {
-                        severity: DiagnosticSeverity::SoftError,
-                        category: DiagnosticCategory::PatternLoad,
-                        message: format!("Failed to write output file: {}", e),
+                let resolve = |indices: &[u32]| {
+                    indices
+                        .iter()
+                        .filter_map(|&i| self.interner.resolve(result.all_files[i as usize].path))
+                        .collect::<Vec<&str>>()
+                };
+                let filtered_paths = resolve(&result.filtered_indices);
+                let type_categories = [
+                    ("added_files", resolve(&outputs.filtered_added)),
+                    ("modified_files", resolve(&outputs.filtered_modified)),
+                    ("deleted_files", resolve(&outputs.filtered_deleted)),
+                    ("renamed_files", resolve(&outputs.filtered_renamed)),
+                    ("copied_files", resolve(&outputs.filtered_copied)),
+                ];
+
+                // Reported files go first, each with its diagnostic prefix
+                let text = OutputFormat::Text {
+                    separator: &self.config.files_separator,
+                };
+                let mut files = vec![OutputFile {
+                    name: "all_changed_files",
+                    values: &filtered_paths,
+                    format: text,
+                }];
+                let mut reported = vec!["Failed to write output file"];
+                if self.config.json {
+                    files.push(OutputFile {
+                        name: "all_changed_files",
+                        values: &filtered_paths,
+                        format: OutputFormat::Json,
                     });
+                    reported.push("Failed to write JSON output");
                 }
 
-                // Write JSON output
-                if self.config.json {
-                    if let Err(e) = crate::output::writer::OutputWriter::write_json(
-                        dir,
-                        "all_changed_files",
-                        &filtered_paths,
-                    ) {
+                // Per-change-type outputs are best effort
+                files.extend(type_categories.iter().map(|(name, paths)| OutputFile {
+                    name,
+                    values: paths,
+                    format: text,
+                }));
+
+                let written = OutputWriter::write_batch(dir, &files);
+                for (prefix, outcome) in reported.iter().zip(written) {
+                    if let Err(e) = outcome {
                         result.diagnostics.push(Diagnostic {
                             severity: DiagnosticSeverity::SoftError,
                             category: DiagnosticCategory::PatternLoad,
-                            message: format!("Failed to write JSON output: {}", e),
+                            message: format!("{}: {}", prefix, e),
                         });
                     }
                 }
-
-                // Write per-change-type outputs
-                let type_categories = [
-                    ("added_files", &outputs.filtered_added),
-                    ("modified_files", &outputs.filtered_modified),
-                    ("deleted_files", &outputs.filtered_deleted),
-                    ("renamed_files", &outputs.filtered_renamed),
-                    ("copied_files", &outputs.filtered_copied),
-                ];
-
-                for (name, indices) in &type_categories {
-                    let paths: Vec<&str> = indices
-                        .iter()
-                        .filter_map(|&i| self.interner.resolve(result.all_files[i as usize].path))
-                        .collect();
-                    let _ = crate::output::writer::OutputWriter::write_text(
-                        dir,
-                        name,
-                        &paths,
-                        &self.config.files_separator,
-                    );
-                }
             }
         }
 
         Ok(result)
     }
 
+    /// Check whether the range has any changed file that passes the patterns
+    ///
+    /// Same answer as `!process().await?.filtered_indices.is_empty()`, but
+    /// for plain diff + pattern configs the diff walk stops at the first
+    /// matching path and no result is built. Configs whose file set depends
+    /// on more than the tree diff (REST API, submodules, workflow tracking,
+    /// ancestor lookup) or that write files as a side effect run the full
+    /// pipeline.
+    pub async fn any_changed(&self) -> Result<bool> {
+        let config = self.config;
+        if config.use_rest_api
+            || config.include_submodules
+            || config.track_workflow_failures
+            || config.files_ancestor_lookup_depth > 0
+            || config.recover_deleted_files
+            || config.write_output_files
+        {
+            return Ok(!self.process().await?.filtered_indices.is_empty());
+        }
+
+        let sha_resolver = ShaResolver::new(self.git_ops.path());
+        let (base_sha, head_sha) = sha_resolver.resolve_event_aware(config)?;
+        if config.skip_same_sha && base_sha == head_sha {
+            return Ok(false);
+        }
+
+        let matcher = self.build_pattern_matcher()?;
+        let accept = |path: &str| matcher.as_ref().is_none_or(|m| m.matches_sync(path));
+
+        // A cached diff answers without touching git
+        if let Some(cached) = self
+            .diff_cache
+            .and_then(|cache| cache.get(&base_sha, &head_sha, &config.diff_filter))
+        {
+            return Ok(cached
+                .files
+                .iter()
+                .any(|file| self.interner.resolve(file.path).is_some_and(accept)));
+        }
+
+        match self
+            .git_ops
+            .any_delta_sync(&base_sha, &head_sha, &config.diff_filter, accept)
+        {
+            Ok(found) => Ok(found),
+            // Soft-fail like process(): a failed diff reports no changes
+            Err(_) if !config.fail_on_initial_diff_error => Ok(false),
+            Err(e) => Err(e),
+        }
+    }
+
+    /// Compute the raw tree diff, consulting the diff cache when one is attached
+    async fn compute_diff(&self, base_sha: &str, head_sha: &str) -> Result<DiffResult> {
+        let diff_filter = &self.config.diff_filter;
+        if let Some(cached) = self
+            .diff_cache
+            .and_then(|cache| cache.get(base_sha, head_sha, diff_filter))
+        {
+            return Ok(DiffResult::clone(&cached));
+        }
+
+        let diff = self
+            .git_ops
+            .diff(base_sha, head_sha, self.interner, diff_filter)
+            .await?;
+        if let Some(cache) = self.diff_cache {
+            cache.insert(base_sha, head_sha, diff_filter, diff.clone());
+        }
+        Ok(diff)
+    }
+
     /// Build a combined pattern matcher from all sources (inline, source file, YAML)
-    fn build_pattern_matcher(&self) -> Result<Option<PatternMatcher>> {
+    fn build_pattern_matcher(&self) -> Result<Option<Cow<'a, PatternMatcher>>> {
+        if let Some(matcher) = self.pattern_matcher {
+            return Ok(Some(Cow::Borrowed(matcher)));
+        }
+
         // Source file patterns (must be loaded into owned buffer)
         let mut source_buf = String::new();
         let mut source_patterns: Vec<&str> = Vec::new();
@@ -385,7 +472,7 @@ impl<'a> FileProcessor<'a> {
             self.config.negation_patterns_first,
         )?;
 
-        Ok(Some(matcher))
+        Ok(Some(Cow::Owned(matcher)))
     }
 
     /// Recover unmatched files whose ancestor directories contain pattern-matched files.
@@ -512,7 +599,7 @@ impl<'a> FileProcessor<'a> {
     /// Load YAML groups once for reuse by both workflow tracker and group filtering.
     ///
     /// Priority: files_yaml > files_group_by. If both set, YAML wins with a diagnostic.
-    fn load_yaml_groups(&self, result: &mut ProcessedResult) -> Vec<PatternGroup> {
+    fn load_yaml_groups(&self, result: &mut ProcessedResult) -> Arc<[PatternGroup]> {
         match self.load_yaml_content() {
             Ok(Some(yaml_content)) => {
                 if self.config.files_group_by.is_some() {
@@ -522,7 +609,7 @@ impl<'a> FileProcessor<'a> {
                         message: "Both files_yaml and files_group_by set; using files_yaml".into(),
                     });
                 }
-                match PatternLoader::load_yaml_groups(
+                match PatternLoader::load_yaml_groups_cached(
                     &yaml_content,
                     self.config.negation_patterns_first,
                 ) {
@@ -533,7 +620,7 @@ impl<'a> FileProcessor<'a> {
                             category: DiagnosticCategory::PatternLoad,
                             message: format!("YAML pattern load failed: {}", e),
                         });
-                        return Vec::new();
+                        return Vec::new().into();
                     }
                 }
             }
@@ -544,7 +631,7 @@ impl<'a> FileProcessor<'a> {
                     category: DiagnosticCategory::PatternLoad,
                     message: format!("Failed to load YAML content: {}", e),
                 });
-                return Vec::new();
+                return Vec::new().into();
             }
         }
 
@@ -566,7 +653,7 @@ impl<'a> FileProcessor<'a> {
                         self.config.negation_patterns_first,
                         key_mode,
                     ) {
-                        Ok(groups) => return groups,
+                        Ok(groups) => return groups.into(),
                         Err(e) => {
                             result.diagnostics.push(Diagnostic {
                                 severity: DiagnosticSeverity::SoftError,
@@ -586,7 +673,7 @@ impl<'a> FileProcessor<'a> {
             }
         }
 
-        Vec::new()
+        Vec::new().into()
     }
 
     /// Enhanced workflow checking with success tracking and job-level detail
@@ -768,6 +855,49 @@ mod tests {
         assert!(result.unmatched_indices.is_empty());
     }
 
+    #[tokio::test]
+    async fn test_any_changed_with_patterns() {
+        let (_dir, repo_path) = create_test_repo();
+
+        fs::write(repo_path.join("lib.rs"), "fn main() {}").unwrap();
+        std::process::Command::new("git")
+            .args(["add", "."])
+            .current_dir(&repo_path)
+            .output()
+            .unwrap();
+        std::process::Command::new("git")
+            .args(["commit", "-m", "Add lib.rs"])
+            .current_dir(&repo_path)
+            .output()
+            .unwrap();
+
+        let repo = GitRepository::discover(&repo_path).unwrap();
+        let interner = StringInterner::new();
+        let head = repo.resolve_sha_sync("HEAD").unwrap();
+        let base = repo.resolve_sha_sync("HEAD^").unwrap();
+
+        let config_for = |pattern: &'static str| InputConfig {
+            base_sha: Some(Cow::Owned(base.clone())),
+            sha: Some(Cow::Owned(head.clone())),
+            files: Some(vec![Cow::Borrowed(pattern)]),
+            ..Default::default()
+        };
+
+        let rust = config_for("**/*.rs");
+        let processor = FileProcessor::new(&repo, &interner, &rust);
+        assert!(processor.any_changed().await.unwrap());
+
+        let docs = config_for("**/*.md");
+        let processor = FileProcessor::new(&repo, &interner, &docs);
+        assert!(!processor.any_changed().await.unwrap());
+        assert!(processor
+            .process()
+            .await
+            .unwrap()
+            .filtered_indices
+            .is_empty());
+    }
+
     // --- Ancestor recovery tests ---
 
     /// Helper: set up a repo with stacks/prod/*.yaml and a changed .sql in migrations subdir
@@ -1184,4 +1314,25 @@ mod tests {
             "Expected None when no patterns are configured"
         );
     }
+
+    #[test]
+    fn test_build_pattern_matcher_prefers_prebuilt() {
+        let (_dir, repo_path) = create_test_repo();
+        let repo = GitRepository::discover(&repo_path).unwrap();
+        let interner = StringInterner::new();
+
+        let config = InputConfig {
+            files: Some(vec![Cow::Borrowed("src/**")]),
+            ..Default::default()
+        };
+        let prebuilt = PatternMatcher::new(&["docs/**"], &[], false).unwrap();
+
+        let processor =
+            FileProcessor::new(&repo, &interner, &config).with_pattern_matcher(&prebuilt);
+        let matcher = processor.build_pattern_matcher().unwrap().unwrap();
+
+        assert!(matches!(matcher, Cow::Borrowed(_)));
+        assert!(matcher.matches_sync("docs/README.md"));
+        assert!(!matcher.matches_sync("src/lib.rs"));
+    }
 }
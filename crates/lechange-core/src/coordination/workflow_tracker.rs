@@ -10,9 +10,17 @@ use crate::types::{
     WorkflowCheckResult, WorkflowConclusion, WorkflowFailure, WorkflowJob, WorkflowRun,
     WorkflowStatus, WorkflowSuccess,
 };
-use futures::future::{join_all, try_join_all};
+use futures::future::try_join_all;
+use futures::stream::{self, StreamExt};
 use std::collections::{HashMap, HashSet};
 
+/// Upper bound on GitHub API requests in flight for one batch of runs
+///
+/// Large lookbacks fan out into one commit (and jobs) fetch per run; capping
+/// the fan-out keeps those on a few multiplexed connections and clear of the
+/// API's secondary rate limits, while still overlapping round trips.
+const MAX_CONCURRENT_REQUESTS: usize = 16;
+
 /// Extract the matrix key from a job name.
 ///
 /// Looks for text between `[` and `]` brackets.
@@ -239,7 +247,10 @@ impl<'a> WorkflowTracker<'a> {
             })
             .collect();
 
-        let results = join_all(futures).await;
+        let results = stream::iter(futures)
+            .buffered(MAX_CONCURRENT_REQUESTS)
+            .collect::<Vec<_>>()
+            .await;
 
         let mut overlapping = Vec::new();
         let mut blocked_groups: HashMap<InternedString, Vec<u64>> = HashMap::new();
@@ -383,7 +394,10 @@ impl<'a> WorkflowTracker<'a> {
             })
             .collect();
 
-        let results = join_all(futures).await;
+        let results = stream::iter(futures)
+            .buffered(MAX_CONCURRENT_REQUESTS)
+            .collect::<Vec<_>>()
+            .await;
         let failure_results: Vec<WorkflowFailure> = results.into_iter().flatten().collect();
 
         Ok(failure_results)
@@ -486,7 +500,10 @@ impl<'a> WorkflowTracker<'a> {
             })
             .collect();
 
-        let results = join_all(futures).await;
+        let results = stream::iter(futures)
+            .buffered(MAX_CONCURRENT_REQUESTS)
+            .collect::<Vec<_>>()
+            .await;
         let success_results: Vec<WorkflowSuccess> = results.into_iter().flatten().collect();
 
         Ok(success_results)
@@ -1,7 +1,9 @@
 //! Git diff parsing with zero-copy
 
+use crate::cache::LruCache;
 use crate::interner::StringInterner;
-use crate::types::{ChangeType, ChangedFile};
+use crate::types::{ChangeType, ChangedFile, DiffResult};
+use std::sync::Arc;
 
 /// Zero-copy git diff parser
 pub struct DiffParser<'a> {
@@ -70,6 +72,76 @@ impl<'a> DiffParser<'a> {
     }
 }
 
+/// Cache key: resolved base SHA, resolved head SHA, diff filter
+type DiffKey = (String, String, String);
+
+/// LRU cache of raw tree diffs keyed by resolved (base, head, diff_filter)
+///
+/// Cached files hold `InternedString` handles, so a cache must only be
+/// shared between runs that use the same `StringInterner`.
+pub struct DiffCache {
+    entries: LruCache<DiffKey, Arc<DiffResult>>,
+}
+
+impl DiffCache {
+    /// Default number of cached diffs
+    pub const DEFAULT_CAPACITY: usize = 16;
+
+    /// Create a cache holding at most `capacity` diffs
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            entries: LruCache::new(capacity),
+        }
+    }
+
+    /// Look up the diff for a resolved SHA pair
+    pub fn get(
+        &self,
+        base_sha: &str,
+        head_sha: &str,
+        diff_filter: &str,
+    ) -> Option<Arc<DiffResult>> {
+        self.entries.get(&(
+            base_sha.to_string(),
+            head_sha.to_string(),
+            diff_filter.to_string(),
+        ))
+    }
+
+    /// Store the diff for a resolved SHA pair
+    pub fn insert(&self, base_sha: &str, head_sha: &str, diff_filter: &str, diff: DiffResult) {
+        self.entries.insert(
+            (
+                base_sha.to_string(),
+                head_sha.to_string(),
+                diff_filter.to_string(),
+            ),
+            Arc::new(diff),
+        );
+    }
+
+    /// Number of cached diffs
+    pub fn len(&self) -> usize {
+        self.entries.len()
+    }
+
+    /// Whether the cache is empty
+    pub fn is_empty(&self) -> bool {
+        self.entries.is_empty()
+    }
+
+    /// Drop every cached diff
+    pub fn clear(&self) {
+        self.entries.clear();
+    }
+}
+
+impl Default for DiffCache {
+    fn default() -> Self {
+        Self::new(Self::DEFAULT_CAPACITY)
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -102,4 +174,27 @@ mod tests {
             Some("old/path.rs")
         );
     }
+
+    #[test]
+    fn test_diff_cache_keyed_by_filter() {
+        let interner = StringInterner::new();
+        let parser = DiffParser::new(&interner);
+        let cache = DiffCache::default();
+
+        let diff = DiffResult {
+            files: vec![parser.parse_diff_line(b"A\tsrc/lib.rs").unwrap()],
+            additions: 3,
+            deletions: 0,
+        };
+        cache.insert("base", "head", "ACM", diff);
+
+        let hit = cache.get("base", "head", "ACM").unwrap();
+        assert_eq!(hit.files.len(), 1);
+        assert_eq!(hit.additions, 3);
+        assert!(cache.get("base", "head", "D").is_none());
+        assert!(cache.get("head", "base", "ACM").is_none());
+
+        cache.clear();
+        assert!(cache.is_empty());
+    }
 }
@@ -6,6 +6,7 @@ pub mod repository;
 pub mod sha;
 pub mod submodule;
 
+pub use diff::DiffCache;
 pub use recovery::FileRecovery;
 pub use repository::GitRepository;
 pub use sha::ShaResolver;
@@ -1,6 +1,8 @@
 //! Git repository operations with async support
 
+use std::cell::RefCell;
 use std::future::Future;
+use std::ops::Deref;
 use std::path::{Path, PathBuf};
 
 use crate::error::{Error, Result};
@@ -10,6 +12,81 @@ use crate::interner::StringInterner;
 use crate::traits::AsyncGitOps;
 use crate::types::{ChangeType, ChangedFile, DiffResult};
 
+/// Open repository handles kept per thread, most recently used last
+const REPO_HANDLES_PER_THREAD: usize = 4;
+
+/// Pooled handles with the path each was opened from
+type PooledRepos = Vec<(PathBuf, git2::Repository)>;
+
+thread_local! {
+    /// Reusable `git2::Repository` handles, keyed by repository path
+    ///
+    /// Opening a repository re-reads its config and pack indexes, and a fresh
+    /// handle starts with an empty object cache. Keeping handles per thread
+    /// (they are `Send` but not `Sync`) lets repeated diffs on one repository
+    /// reuse both. libgit2 re-checks refs on lookup and rescans packs on an
+    /// object miss, so a reused handle still sees new commits and fetches.
+    static REPO_HANDLES: RefCell<PooledRepos> = const { RefCell::new(Vec::new()) };
+}
+
+/// A `git2::Repository` borrowed from the per-thread pool
+///
+/// Dereferences to the repository and goes back to the pool on drop. The
+/// handle is taken out of the pool while in use, so nested `get_repo` calls
+/// on one thread simply open a second handle.
+struct RepoHandle {
+    path: PathBuf,
+    repo: Option<git2::Repository>,
+}
+
+impl RepoHandle {
+    fn open(path: &Path) -> Result<Self> {
+        let pooled = REPO_HANDLES.with(|handles| {
+            let mut handles = handles.borrow_mut();
+            let index = handles.iter().position(|(p, _)| p == path)?;
+            Some(handles.remove(index).1)
+        });
+        let repo = match pooled {
+            Some(repo) => repo,
+            None => git2::Repository::open(path)?,
+        };
+        Ok(Self {
+            path: path.to_path_buf(),
+            repo: Some(repo),
+        })
+    }
+}
+
+impl Deref for RepoHandle {
+    type Target = git2::Repository;
+
+    fn deref(&self) -> &git2::Repository {
+        self.repo
+            .as_ref()
+            .expect("repository is present until drop")
+    }
+}
+
+impl Drop for RepoHandle {
+    fn drop(&mut self) {
+        if let Some(repo) = self.repo.take() {
+            let path = std::mem::take(&mut self.path);
+            // The pool may already be gone during thread teardown
+            let _ = REPO_HANDLES.try_with(|handles| {
+                if let Ok(mut handles) = handles.try_borrow_mut() {
+                    if handles.iter().any(|(p, _)| *p == path) {
+                        return;
+                    }
+                    if handles.len() >= REPO_HANDLES_PER_THREAD {
+                        handles.remove(0);
+                    }
+                    handles.push((path, repo));
+                }
+            });
+        }
+    }
+}
+
 /// Git repository wrapper that handles Send/Sync constraints
 ///
 /// git2::Repository is not Send/Sync due to internal raw pointers.
@@ -56,11 +133,9 @@ impl GitRepository {
         }
     }
 
-    /// Get or create a repository instance (for internal use)
-    fn get_repo(&self) -> Result<git2::Repository> {
-        // Always reopen the repository
-        // git2 has internal caching so this is cheap
-        Ok(git2::Repository::open(&self.path)?)
+    /// Get a repository handle from the per-thread pool (for internal use)
+    fn get_repo(&self) -> Result<RepoHandle> {
+        RepoHandle::open(&self.path)
     }
 
     /// Resolve a SHA to its tree, handling the empty tree SHA (initial push).
@@ -255,32 +330,12 @@ impl GitRepository {
         // Process each delta
         diff.foreach(
             &mut |delta, _progress| {
-                let status = delta.status();
-
-                // Map git2 status to our ChangeType
-                use crate::types::ChangeType;
-                let change_type = match status {
-                    git2::Delta::Added => ChangeType::Added,
-                    git2::Delta::Deleted => ChangeType::Deleted,
-                    git2::Delta::Modified => ChangeType::Modified,
-                    git2::Delta::Renamed => ChangeType::Renamed,
-                    git2::Delta::Copied => ChangeType::Copied,
-                    git2::Delta::Typechange => ChangeType::TypeChanged,
-                    git2::Delta::Conflicted => ChangeType::Unmerged,
-                    _ => ChangeType::Unknown,
+                // Map git2 status to our ChangeType and filter by diff_filter
+                let change_type = match Self::filtered_change_type(delta.status(), diff_filter) {
+                    Some(change_type) => change_type,
+                    None => return true, // Continue
                 };
 
-                // Filter by diff_filter
-                let type_char = change_type
-                    .as_str()
-                    .chars()
-                    .next()
-                    .unwrap_or('X')
-                    .to_ascii_uppercase();
-                if !diff_filter.contains(type_char) {
-                    return true; // Continue
-                }
-
                 // Get file paths
                 let new_file = delta.new_file();
                 let old_file = delta.old_file();
@@ -321,6 +376,67 @@ impl GitRepository {
         Ok(result)
     }
 
+    /// Check whether any delta between two commits passes `diff_filter` and `accept`
+    ///
+    /// Deltas are visited in diff order and the walk stops at the first
+    /// accepted path, so nothing is interned or collected.
+    pub fn any_delta_sync<F>(
+        &self,
+        base_sha: &str,
+        head_sha: &str,
+        diff_filter: &str,
+        mut accept: F,
+    ) -> Result<bool>
+    where
+        F: FnMut(&str) -> bool,
+    {
+        let repo = self.get_repo()?;
+
+        let base_oid = git2::Oid::from_str(base_sha)
+            .map_err(|e| Error::Git(format!("Invalid base SHA '{}': {}", base_sha, e)))?;
+        let head_oid = git2::Oid::from_str(head_sha)
+            .map_err(|e| Error::Git(format!("Invalid head SHA '{}': {}", head_sha, e)))?;
+
+        let base_tree = Self::sha_to_tree(&repo, base_oid, base_sha)?;
+        let head_tree = Self::sha_to_tree(&repo, head_oid, head_sha)?;
+
+        let mut opts = git2::DiffOptions::new();
+        opts.ignore_submodules(true);
+
+        let diff = repo.diff_tree_to_tree(Some(&base_tree), Some(&head_tree), Some(&mut opts))?;
+
+        Ok(diff.deltas().any(|delta| {
+            Self::filtered_change_type(delta.status(), diff_filter).is_some()
+                && delta
+                    .new_file()
+                    .path()
+                    .and_then(|p| p.to_str())
+                    .is_some_and(|path| accept(path))
+        }))
+    }
+
+    /// Map a git2 delta status to a `ChangeType`, or `None` if `diff_filter` excludes it
+    fn filtered_change_type(status: git2::Delta, diff_filter: &str) -> Option<ChangeType> {
+        let change_type = match status {
+            git2::Delta::Added => ChangeType::Added,
+            git2::Delta::Deleted => ChangeType::Deleted,
+            git2::Delta::Modified => ChangeType::Modified,
+            git2::Delta::Renamed => ChangeType::Renamed,
+            git2::Delta::Copied => ChangeType::Copied,
+            git2::Delta::Typechange => ChangeType::TypeChanged,
+            git2::Delta::Conflicted => ChangeType::Unmerged,
+            _ => ChangeType::Unknown,
+        };
+
+        let type_char = change_type
+            .as_str()
+            .chars()
+            .next()
+            .unwrap_or('X')
+            .to_ascii_uppercase();
+        diff_filter.contains(type_char).then_some(change_type)
+    }
+
     /// Resolve a reference to a SHA (sync version)
     pub fn resolve_sha_sync(&self, reference: &str) -> Result<String> {
         let repo = self.get_repo()?;
@@ -344,6 +460,27 @@ impl GitRepository {
         Ok(resolved.id().to_string())
     }
 
+    /// SHAs of every commit reachable from `rev`, oldest first
+    ///
+    /// Parents always precede their children (topological order), matching
+    /// `git log --reverse --topo-order <rev>` without spawning git.
+    pub fn commit_shas_sync(&self, rev: &str) -> Result<Vec<String>> {
+        let repo = self.get_repo()?;
+        let head = repo
+            .revparse_single(rev)
+            .map_err(|e| Error::Git(format!("Failed to resolve reference '{}': {}", rev, e)))?;
+        let head = head.peel_to_commit()?;
+
+        let mut revwalk = repo.revwalk()?;
+        revwalk.push(head.id())?;
+        revwalk.set_sorting(git2::Sort::TOPOLOGICAL | git2::Sort::REVERSE)?;
+        let mut shas = Vec::new();
+        for oid in revwalk {
+            shas.push(oid?.to_string());
+        }
+        Ok(shas)
+    }
+
     /// Get list of submodule paths (sync version)
     pub fn submodules_sync(&self) -> Result<Vec<String>> {
         let repo = self.get_repo()?;
@@ -410,28 +547,12 @@ impl AsyncGitOps for GitRepository {
 
             diff.foreach(
                 &mut |delta, _progress| {
-                    let status = delta.status();
-                    let change_type = match status {
-                        git2::Delta::Added => ChangeType::Added,
-                        git2::Delta::Deleted => ChangeType::Deleted,
-                        git2::Delta::Modified => ChangeType::Modified,
-                        git2::Delta::Renamed => ChangeType::Renamed,
-                        git2::Delta::Copied => ChangeType::Copied,
-                        git2::Delta::Typechange => ChangeType::TypeChanged,
-                        git2::Delta::Conflicted => ChangeType::Unmerged,
-                        _ => ChangeType::Unknown,
+                    let change_type = match Self::filtered_change_type(delta.status(), &diff_filter)
+                    {
+                        Some(change_type) => change_type,
+                        None => return true,
                     };
 
-                    let type_char = change_type
-                        .as_str()
-                        .chars()
-                        .next()
-                        .unwrap_or('X')
-                        .to_ascii_uppercase();
-                    if !diff_filter.contains(type_char) {
-                        return true;
-                    }
-
                     let new_file = delta.new_file();
                     let old_file = delta.old_file();
 
@@ -565,6 +686,29 @@ mod tests {
         assert_eq!(sha.len(), 40); // SHA is 40 hex characters
     }
 
+    #[test]
+    fn test_commit_shas_oldest_first() {
+        let (dir, repo) = create_test_repo();
+        let first = repo.resolve_sha_sync("HEAD").unwrap();
+
+        fs::write(dir.path().join("file2.txt"), "content2").unwrap();
+        for args in [&["add", "."][..], &["commit", "-m", "Second commit"][..]] {
+            std::process::Command::new("git")
+                .args(args)
+                .current_dir(dir.path())
+                .output()
+                .unwrap();
+        }
+        let second = repo.resolve_sha_sync("HEAD").unwrap();
+
+        assert_eq!(
+            repo.commit_shas_sync("HEAD").unwrap(),
+            vec![first.clone(), second]
+        );
+        assert_eq!(repo.commit_shas_sync("HEAD~1").unwrap(), vec![first]);
+        assert!(repo.commit_shas_sync("no-such-branch").is_err());
+    }
+
     #[tokio::test]
     async fn test_async_resolve_sha() {
         let (_dir, repo) = create_test_repo();
@@ -665,6 +809,31 @@ mod tests {
         assert!(!result);
     }
 
+    #[test]
+    fn test_repo_handles_are_pooled_per_thread() {
+        let (_dir, repo) = create_test_repo();
+        let pooled = || {
+            REPO_HANDLES.with(|handles| {
+                handles
+                    .borrow()
+                    .iter()
+                    .filter(|(p, _)| *p == repo.path)
+                    .count()
+            })
+        };
+
+        drop(repo.get_repo().unwrap());
+        assert_eq!(pooled(), 1);
+
+        // Nested handles both work and only one is kept afterwards
+        let outer = repo.get_repo().unwrap();
+        assert_eq!(pooled(), 0);
+        let sha = repo.resolve_sha_sync("HEAD").unwrap();
+        assert_eq!(outer.head().unwrap().target().unwrap().to_string(), sha);
+        drop(outer);
+        assert_eq!(pooled(), 1);
+    }
+
     #[test]
     fn test_git_repository_struct_size_no_arc_overhead() {
         // GitRepository should be exactly the size of a PathBuf (no Arc/Mutex wrapping).
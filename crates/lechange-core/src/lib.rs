@@ -32,6 +32,7 @@
 #![feature(impl_trait_in_assoc_type)]
 #![warn(missing_docs, rust_2018_idioms)]
 
+pub mod cache;
 pub mod coordination;
 pub mod error;
 pub mod file_ops;
@@ -3,19 +3,7 @@
 /// Escape a string for JSON output
 pub fn escape_json_value(s: &str) -> String {
     let mut result = String::with_capacity(s.len() + 8);
-    for ch in s.chars() {
-        match ch {
-            '"' => result.push_str("\\\""),
-            '\\' => result.push_str("\\\\"),
-            '\n' => result.push_str("\\n"),
-            '\r' => result.push_str("\\r"),
-            '\t' => result.push_str("\\t"),
-            c if c.is_control() => {
-                result.push_str(&format!("\\u{:04x}", c as u32));
-            }
-            c => result.push(c),
-        }
-    }
+    escape_json_into(s, &mut result);
     result
 }
 
@@ -29,17 +17,55 @@ pub fn safe_output_escape(s: &str) -> String {
 /// Format a list of values as a JSON array string
 pub fn format_json_array(values: &[&str]) -> String {
     let mut buf = String::with_capacity(values.len() * 16 + 2);
+    write_json_array(values.iter().copied(), &mut buf);
+    buf
+}
+
+/// Append a JSON array of `values` to `buf`
+///
+/// Lets callers that know the total byte length pre-size the buffer and
+/// build the array in a single allocation.
+pub fn write_json_array<'a, I>(values: I, buf: &mut String)
+where
+    I: IntoIterator<Item = &'a str>,
+{
     buf.push('[');
-    for (i, v) in values.iter().enumerate() {
+    for (i, v) in values.into_iter().enumerate() {
         if i > 0 {
             buf.push(',');
         }
         buf.push('"');
-        escape_json_into(v, &mut buf);
+        escape_json_into(v, buf);
         buf.push('"');
     }
     buf.push(']');
-    buf
+}
+
+/// Stream a JSON array of `values` to `out`
+///
+/// Same output as `format_json_array`, written piece by piece so only the
+/// writer's buffer is ever held in memory.
+pub fn stream_json_array<'a, I, W>(values: I, out: &mut W) -> std::io::Result<()>
+where
+    I: IntoIterator<Item = &'a str>,
+    W: std::io::Write,
+{
+    out.write_all(b"[")?;
+    for (i, v) in values.into_iter().enumerate() {
+        if i > 0 {
+            out.write_all(b",")?;
+        }
+        out.write_all(b"\"")?;
+        let mut result = Ok(());
+        escape_json_with(v, |part| {
+            if result.is_ok() {
+                result = out.write_all(part.as_bytes());
+            }
+        });
+        result?;
+        out.write_all(b"\"")?;
+    }
+    out.write_all(b"]")
 }
 
 /// Format as a GitHub Actions matrix value
@@ -60,19 +86,92 @@ pub fn format_matrix(values: &[&str]) -> String {
 
 /// Write a JSON-escaped string directly into a buffer — zero intermediate allocation.
 pub fn escape_json_into(s: &str, buf: &mut String) {
-    for ch in s.chars() {
-        match ch {
-            '"' => buf.push_str("\\\""),
-            '\\' => buf.push_str("\\\\"),
-            '\n' => buf.push_str("\\n"),
-            '\r' => buf.push_str("\\r"),
-            '\t' => buf.push_str("\\t"),
-            c if c.is_control() => {
-                use std::fmt::Write;
-                let _ = write!(buf, "\\u{:04x}", c as u32);
+    escape_json_with(s, |part| buf.push_str(part));
+}
+
+/// Per-byte escape action: 0 = copy, `u` = `\u00XX`, `C1` = check for a
+/// U+0080..U+009F control, anything else = the character after the backslash
+const ESCAPE: [u8; 256] = {
+    let mut table = [0u8; 256];
+    let mut b = 0;
+    while b < 0x20 {
+        table[b] = b'u';
+        b += 1;
+    }
+    table[b'\n' as usize] = b'n';
+    table[b'\r' as usize] = b'r';
+    table[b'\t' as usize] = b't';
+    table[b'"' as usize] = b'"';
+    table[b'\\' as usize] = b'\\';
+    table[0x7f] = b'u';
+    // Lead byte of U+0080..U+00BF; only U+0080..U+009F are controls
+    table[0xc2] = C1;
+    table
+};
+
+/// Marker in `ESCAPE` for the 0xC2 lead byte
+const C1: u8 = 1;
+
+const HEX: &[u8; 16] = b"0123456789abcdef";
+
+/// JSON-escape `s`, passing output pieces to `emit`
+///
+/// Escapes `"`, `\\` and every Unicode control character (C0, DEL, C1).
+/// Works on bytes: runs that need no escaping are emitted as one slice, and
+/// only ASCII bytes or the 0xC2 lead byte ever split a run, so every slice
+/// stays on a char boundary.
+pub fn escape_json_with<F>(s: &str, mut emit: F)
+where
+    F: FnMut(&str),
+{
+    let bytes = s.as_bytes();
+    let mut start = 0;
+    let mut i = 0;
+
+    while i < bytes.len() {
+        let action = ESCAPE[bytes[i] as usize];
+        if action == 0 {
+            i += 1;
+            continue;
+        }
+
+        let code = if action == C1 {
+            match bytes.get(i + 1) {
+                Some(&next @ 0x80..=0x9f) => next,
+                _ => {
+                    i += 1;
+                    continue;
+                }
             }
-            c => buf.push(c),
+        } else {
+            bytes[i]
+        };
+
+        if start < i {
+            emit(&s[start..i]);
+        }
+
+        if action == b'u' || action == C1 {
+            let escaped = [
+                b'\\',
+                b'u',
+                b'0',
+                b'0',
+                HEX[(code >> 4) as usize],
+                HEX[(code & 0xf) as usize],
+            ];
+            emit(std::str::from_utf8(&escaped).unwrap_or_default());
+        } else {
+            let escaped = [b'\\', action];
+            emit(std::str::from_utf8(&escaped).unwrap_or_default());
         }
+
+        i += if action == C1 { 2 } else { 1 };
+        start = i;
+    }
+
+    if start < bytes.len() {
+        emit(&s[start..]);
     }
 }
 
@@ -203,6 +302,13 @@ mod tests {
         assert_eq!(buf, "a\\nb\\tc\\\\d");
     }
 
+    #[test]
+    fn test_escape_json_into_del_and_c1_controls() {
+        let mut buf = String::new();
+        escape_json_into("a\x7fb\u{85}c\u{a0}d", &mut buf);
+        assert_eq!(buf, "a\\u007fb\\u0085c\u{a0}d");
+    }
+
     #[test]
     fn test_safe_output_escape() {
         assert_eq!(safe_output_escape("hello"), "hello");
@@ -216,6 +322,14 @@ mod tests {
         assert_eq!(format_json_array(&["a", "b"]), r#"["a","b"]"#);
     }
 
+    #[test]
+    fn test_stream_json_array_matches_format() {
+        let values = ["a.rs", "dir/\"quoted\"", "tab\there", "\u{85}"];
+        let mut out = Vec::new();
+        stream_json_array(values.iter().copied(), &mut out).unwrap();
+        assert_eq!(String::from_utf8(out).unwrap(), format_json_array(&values));
+    }
+
     #[test]
     fn test_format_matrix() {
         assert_eq!(format_matrix(&[]), r#"{"include":[]}"#);
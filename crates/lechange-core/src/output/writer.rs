@@ -1,8 +1,62 @@
 //! File output writer for writing results to files
 
 use crate::error::Result;
+use rayon::prelude::*;
+use std::fs::File;
+use std::io::{BufWriter, Write};
 use std::path::Path;
 
+/// Write buffer size for output files
+const BUFFER_CAPACITY: usize = 64 * 1024;
+
+/// Serialization used for one output file
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum OutputFormat<'a> {
+    /// `<name>.txt`, values joined by the separator
+    Text {
+        /// Written between consecutive values
+        separator: &'a str,
+    },
+    /// `<name>.json`, values as a JSON array of strings
+    Json,
+}
+
+/// One file submitted to `OutputWriter::write_batch`
+#[derive(Debug, Clone, Copy)]
+pub struct OutputFile<'a> {
+    /// File name without extension
+    pub name: &'a str,
+    /// Values to write, in order
+    pub values: &'a [&'a str],
+    /// Serialization, which also picks the extension
+    pub format: OutputFormat<'a>,
+}
+
+impl OutputFile<'_> {
+    fn write(&self, output_dir: &Path) -> Result<()> {
+        match self.format {
+            OutputFormat::Text { separator } => {
+                let path = output_dir.join(format!("{}.txt", self.name));
+                let mut out = BufWriter::with_capacity(BUFFER_CAPACITY, File::create(&path)?);
+                for (i, value) in self.values.iter().enumerate() {
+                    if i > 0 {
+                        out.write_all(separator.as_bytes())?;
+                    }
+                    out.write_all(value.as_bytes())?;
+                }
+                out.flush()?;
+            }
+            OutputFormat::Json => {
+                let path = output_dir.join(format!("{}.json", self.name));
+                let mut out = BufWriter::with_capacity(BUFFER_CAPACITY, File::create(&path)?);
+                super::json_format::stream_json_array(self.values.iter().copied(), &mut out)?;
+                out.flush()?;
+            }
+        }
+        Ok(())
+    }
+}
+
 /// Output file writer
 pub struct OutputWriter;
 
@@ -14,18 +68,38 @@ impl OutputWriter {
         values: &[&str],
         separator: &str,
     ) -> Result<()> {
-        let path = output_dir.join(format!("{}.txt", name));
-        let content = values.join(separator);
-        std::fs::write(&path, content)?;
-        Ok(())
+        OutputFile {
+            name,
+            values,
+            format: OutputFormat::Text { separator },
+        }
+        .write(output_dir)
     }
 
     /// Write a JSON array to a file
     pub fn write_json(output_dir: &Path, name: &str, values: &[&str]) -> Result<()> {
-        let path = output_dir.join(format!("{}.json", name));
-        let content = super::json_format::format_json_array(values);
-        std::fs::write(&path, content)?;
-        Ok(())
+        OutputFile {
+            name,
+            values,
+            format: OutputFormat::Json,
+        }
+        .write(output_dir)
+    }
+
+    /// Write several output files, in parallel when there is more than one
+    ///
+    /// Open/write/close latency dominates for small outputs, so files are
+    /// written concurrently on the rayon pool rather than one after another.
+    /// Returns one result per entry, in entry order; a failed file does not
+    /// stop the others from being written.
+    pub fn write_batch(output_dir: &Path, files: &[OutputFile<'_>]) -> Vec<Result<()>> {
+        if files.len() <= 1 {
+            return files.iter().map(|file| file.write(output_dir)).collect();
+        }
+        files
+            .par_iter()
+            .map(|file| file.write(output_dir))
+            .collect()
     }
 }
 
@@ -50,6 +124,16 @@ mod tests {
         assert_eq!(content, "a.rs,b.rs");
     }
 
+    #[test]
+    fn test_write_text_larger_than_buffer() {
+        let dir = TempDir::new().unwrap();
+        let values: Vec<String> = (0..20_000).map(|i| format!("src/file_{}.rs", i)).collect();
+        let refs: Vec<&str> = values.iter().map(String::as_str).collect();
+        OutputWriter::write_text(dir.path(), "files", &refs, "\n").unwrap();
+        let content = std::fs::read_to_string(dir.path().join("files.txt")).unwrap();
+        assert_eq!(content, refs.join("\n"));
+    }
+
     #[test]
     fn test_write_json() {
         let dir = TempDir::new().unwrap();
@@ -76,4 +160,54 @@ mod tests {
         assert!(content.starts_with('['));
         assert!(content.ends_with(']'));
     }
+
+    #[test]
+    fn test_write_batch_mixed_formats() {
+        let dir = TempDir::new().unwrap();
+        let files = [
+            OutputFile {
+                name: "all",
+                values: &["a.rs", "b.rs"],
+                format: OutputFormat::Text { separator: " " },
+            },
+            OutputFile {
+                name: "all",
+                values: &["a.rs", "b.rs"],
+                format: OutputFormat::Json,
+            },
+            OutputFile {
+                name: "deleted",
+                values: &[],
+                format: OutputFormat::Text { separator: "\n" },
+            },
+        ];
+        let results = OutputWriter::write_batch(dir.path(), &files);
+        assert!(results.iter().all(|r| r.is_ok()));
+
+        let read = |name: &str| std::fs::read_to_string(dir.path().join(name)).unwrap();
+        assert_eq!(read("all.txt"), "a.rs b.rs");
+        assert_eq!(read("all.json"), r#"["a.rs","b.rs"]"#);
+        assert_eq!(read("deleted.txt"), "");
+    }
+
+    #[test]
+    fn test_write_batch_reports_each_failure() {
+        let dir = TempDir::new().unwrap();
+        let missing = dir.path().join("missing");
+        let files = [
+            OutputFile {
+                name: "a",
+                values: &["x"],
+                format: OutputFormat::Json,
+            },
+            OutputFile {
+                name: "b",
+                values: &["y"],
+                format: OutputFormat::Text { separator: "," },
+            },
+        ];
+        let results = OutputWriter::write_batch(&missing, &files);
+        assert_eq!(results.len(), 2);
+        assert!(results.iter().all(|r| r.is_err()));
+    }
 }
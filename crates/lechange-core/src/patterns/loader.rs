@@ -1,10 +1,21 @@
 //! Unified pattern loading from source files and YAML
 
+use crate::cache::LruCache;
 use crate::error::{Error, Result};
 use crate::patterns::matcher::PatternMatcher;
 use crate::types::GroupByKey;
+use serde::de::{self, Deserialize, DeserializeSeed, Deserializer, MapAccess, SeqAccess, Visitor};
+use std::borrow::Cow;
 use std::collections::HashMap;
+use std::fmt;
 use std::path::Path;
+use std::sync::{Arc, OnceLock};
+
+/// Cache key: YAML source text, negation_first
+type YamlGroupsKey = (String, bool);
+
+/// Process-wide cache backing `PatternLoader::load_yaml_groups_cached`
+static YAML_GROUPS_CACHE: OnceLock<LruCache<YamlGroupsKey, Arc<[PatternGroup]>>> = OnceLock::new();
 
 /// A named pattern group loaded from YAML
 pub struct PatternGroup {
@@ -46,32 +57,54 @@ impl PatternLoader {
     ///   - src/api/**
     ///   - src/models/**
     /// ```
+    ///
+    /// Groups are returned in document order. The mapping is streamed:
+    /// each group's matcher is compiled as soon as its pattern list has
+    /// been read, so no intermediate map of all patterns is built. Plain
+    /// scalars borrow from `yaml`; only group names (and escaped scalars)
+    /// are allocated. A repeated group name replaces the earlier group.
     pub fn load_yaml_groups(yaml: &str, negation_first: bool) -> Result<Vec<PatternGroup>> {
-        let groups: HashMap<String, Vec<String>> =
-            serde_yaml::from_str(yaml).map_err(|e| Error::Yaml(e.to_string()))?;
-
-        let mut result = Vec::with_capacity(groups.len());
+        let mut pattern_error = None;
+        let seed = YamlGroupsSeed {
+            negation_first,
+            error: &mut pattern_error,
+        };
+        seed.deserialize(serde_yaml::Deserializer::from_str(yaml))
+            .map_err(|e| {
+                pattern_error
+                    .take()
+                    .unwrap_or_else(|| Error::Yaml(e.to_string()))
+            })
+    }
 
-        for (name, patterns) in groups {
-            let pattern_refs: Vec<&str> = patterns.iter().map(|s| s.as_str()).collect();
+    /// Maximum number of YAML documents kept by `load_yaml_groups_cached`
+    pub const YAML_CACHE_CAPACITY: usize = 64;
 
-            // Separate include and exclude patterns (exclude starts with !)
-            let mut includes = Vec::new();
-            let mut excludes = Vec::new();
+    /// Compiled groups for `yaml`, shared through a process-wide LRU
+    ///
+    /// Detections that repeat an identical `files_yaml` (the same config
+    /// run over several ranges, or configs differing only in unrelated
+    /// flags) compile the groups once. Errors are not cached.
+    pub fn load_yaml_groups_cached(
+        yaml: &str,
+        negation_first: bool,
+    ) -> Result<Arc<[PatternGroup]>> {
+        let key: YamlGroupsKey = (yaml.to_string(), negation_first);
+        let cache = YAML_GROUPS_CACHE.get_or_init(|| LruCache::new(Self::YAML_CACHE_CAPACITY));
+        if let Some(groups) = cache.get(&key) {
+            return Ok(groups);
+        }
 
-            for pattern in &pattern_refs {
-                if let Some(stripped) = pattern.strip_prefix('!') {
-                    excludes.push(stripped);
-                } else {
-                    includes.push(*pattern);
-                }
-            }
+        let groups: Arc<[PatternGroup]> = Self::load_yaml_groups(yaml, negation_first)?.into();
+        cache.insert(key, Arc::clone(&groups));
+        Ok(groups)
+    }
 
-            let matcher = PatternMatcher::new(&includes, &excludes, negation_first)?;
-            result.push(PatternGroup { name, matcher });
+    /// Drop every group set held by the `load_yaml_groups_cached` LRU
+    pub fn clear_cache() {
+        if let Some(cache) = YAML_GROUPS_CACHE.get() {
+            cache.clear();
         }
-
-        Ok(result)
     }
 
     /// Parse a `files_group_by` template string.
@@ -193,6 +226,150 @@ impl PatternLoader {
     }
 }
 
+/// Streams a YAML mapping of group name -> pattern list into `PatternGroup`s
+///
+/// Matcher compile errors cannot travel through serde's error type, so the
+/// original error is parked in `error` and surfaced by `load_yaml_groups`.
+struct YamlGroupsSeed<'e> {
+    negation_first: bool,
+    error: &'e mut Option<Error>,
+}
+
+impl<'de> DeserializeSeed<'de> for YamlGroupsSeed<'_> {
+    type Value = Vec<PatternGroup>;
+
+    fn deserialize<D: Deserializer<'de>>(
+        self,
+        deserializer: D,
+    ) -> std::result::Result<Self::Value, D::Error> {
+        deserializer.deserialize_map(self)
+    }
+}
+
+impl<'de> Visitor<'de> for YamlGroupsSeed<'_> {
+    type Value = Vec<PatternGroup>;
+
+    fn expecting(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str("a mapping of group names to pattern lists")
+    }
+
+    fn visit_map<A: MapAccess<'de>>(
+        self,
+        mut map: A,
+    ) -> std::result::Result<Self::Value, A::Error> {
+        let mut groups: Vec<PatternGroup> = Vec::with_capacity(map.size_hint().unwrap_or(0));
+        let mut index: HashMap<Cow<'de, str>, usize> = HashMap::new();
+
+        while let Some(YamlStr(name)) = map.next_key()? {
+            let (includes, excludes) = map.next_value_seed(YamlPatternList)?;
+            let includes: Vec<&str> = includes.iter().map(|p| &**p).collect();
+            let excludes: Vec<&str> = excludes.iter().map(|p| &**p).collect();
+
+            let matcher = match PatternMatcher::new(&includes, &excludes, self.negation_first) {
+                Ok(matcher) => matcher,
+                Err(e) => {
+                    let message = e.to_string();
+                    *self.error = Some(e);
+                    return Err(de::Error::custom(message));
+                }
+            };
+
+            match index.get(&name) {
+                Some(&i) => groups[i].matcher = matcher,
+                None => {
+                    groups.push(PatternGroup {
+                        name: name.to_string(),
+                        matcher,
+                    });
+                    index.insert(name, groups.len() - 1);
+                }
+            }
+        }
+
+        Ok(groups)
+    }
+}
+
+/// One group's pattern list, split into includes and `!` excludes
+struct YamlPatternList;
+
+impl<'de> DeserializeSeed<'de> for YamlPatternList {
+    type Value = (Vec<Cow<'de, str>>, Vec<Cow<'de, str>>);
+
+    fn deserialize<D: Deserializer<'de>>(
+        self,
+        deserializer: D,
+    ) -> std::result::Result<Self::Value, D::Error> {
+        deserializer.deserialize_seq(self)
+    }
+}
+
+impl<'de> Visitor<'de> for YamlPatternList {
+    type Value = (Vec<Cow<'de, str>>, Vec<Cow<'de, str>>);
+
+    fn expecting(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str("a list of glob patterns")
+    }
+
+    fn visit_seq<A: SeqAccess<'de>>(
+        self,
+        mut seq: A,
+    ) -> std::result::Result<Self::Value, A::Error> {
+        let mut includes = Vec::with_capacity(seq.size_hint().unwrap_or(0));
+        let mut excludes = Vec::new();
+
+        while let Some(YamlStr(pattern)) = seq.next_element()? {
+            match pattern {
+                Cow::Borrowed(p) => match p.strip_prefix('!') {
+                    Some(p) => excludes.push(Cow::Borrowed(p)),
+                    None => includes.push(Cow::Borrowed(p)),
+                },
+                Cow::Owned(mut p) => {
+                    if p.starts_with('!') {
+                        p.remove(0);
+                        excludes.push(Cow::Owned(p));
+                    } else {
+                        includes.push(Cow::Owned(p));
+                    }
+                }
+            }
+        }
+
+        Ok((includes, excludes))
+    }
+}
+
+/// A YAML string scalar, borrowed from the input when it needs no unescaping
+struct YamlStr<'de>(Cow<'de, str>);
+
+impl<'de> Deserialize<'de> for YamlStr<'de> {
+    fn deserialize<D: Deserializer<'de>>(deserializer: D) -> std::result::Result<Self, D::Error> {
+        deserializer.deserialize_str(YamlStrVisitor)
+    }
+}
+
+struct YamlStrVisitor;
+
+impl<'de> Visitor<'de> for YamlStrVisitor {
+    type Value = YamlStr<'de>;
+
+    fn expecting(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str("a string")
+    }
+
+    fn visit_borrowed_str<E: de::Error>(self, v: &'de str) -> std::result::Result<Self::Value, E> {
+        Ok(YamlStr(Cow::Borrowed(v)))
+    }
+
+    fn visit_str<E: de::Error>(self, v: &str) -> std::result::Result<Self::Value, E> {
+        Ok(YamlStr(Cow::Owned(v.to_string())))
+    }
+
+    fn visit_string<E: de::Error>(self, v: String) -> std::result::Result<Self::Value, E> {
+        Ok(YamlStr(Cow::Owned(v)))
+    }
+}
+
 /// Parsed `files_group_by` template
 pub struct GroupByTemplate<'a> {
     /// Text before `{group}` (e.g. `"stacks/"`)
@@ -243,10 +420,9 @@ backend:
         let groups = PatternLoader::load_yaml_groups(yaml, true).unwrap();
         assert_eq!(groups.len(), 2);
 
-        // Verify names exist (order may vary due to HashMap)
+        // Groups come back in document order
         let names: Vec<&str> = groups.iter().map(|g| g.name.as_str()).collect();
-        assert!(names.contains(&"frontend"));
-        assert!(names.contains(&"backend"));
+        assert_eq!(names, ["frontend", "backend"]);
 
         // Verify matching works
         let frontend = groups.iter().find(|g| g.name == "frontend").unwrap();
@@ -257,12 +433,52 @@ backend:
         assert!(!frontend.matcher.matches_sync("src/api/routes.ts"));
     }
 
+    #[test]
+    fn test_load_yaml_groups_cached_shares_groups() {
+        let yaml = "cached-test:\n  - \"cached/**\"\n";
+        let first = PatternLoader::load_yaml_groups_cached(yaml, true).unwrap();
+        let second = PatternLoader::load_yaml_groups_cached(yaml, true).unwrap();
+        assert!(Arc::ptr_eq(&first, &second));
+        assert!(second[0].matcher.matches_sync("cached/file.rs"));
+
+        let other_order = PatternLoader::load_yaml_groups_cached(yaml, false).unwrap();
+        assert!(!Arc::ptr_eq(&first, &other_order));
+        assert!(PatternLoader::load_yaml_groups_cached("not: [valid: yaml", true).is_err());
+    }
+
     #[test]
     fn test_load_yaml_invalid() {
         let result = PatternLoader::load_yaml_groups("not: [valid: yaml", true);
         assert!(result.is_err());
     }
 
+    #[test]
+    fn test_load_yaml_duplicate_group_replaces() {
+        let yaml = "app:\n  - \"src/**\"\ndocs:\n  - \"docs/**\"\napp:\n  - \"lib/**\"\n";
+        let groups = PatternLoader::load_yaml_groups(yaml, true).unwrap();
+
+        let names: Vec<&str> = groups.iter().map(|g| g.name.as_str()).collect();
+        assert_eq!(names, ["app", "docs"]);
+        assert!(groups[0].matcher.matches_sync("lib/mod.rs"));
+        assert!(!groups[0].matcher.matches_sync("src/main.rs"));
+    }
+
+    #[test]
+    fn test_load_yaml_escaped_scalars() {
+        // Escaped scalars cannot borrow from the input and take the owned path
+        let yaml = "\"a\\u0070p\":\n  - \"src/\\u002A\\u002A\"\n  - \"!src/\\u0074est/**\"\n";
+        let groups = PatternLoader::load_yaml_groups(yaml, true).unwrap();
+        assert_eq!(groups[0].name, "app");
+        assert!(groups[0].matcher.matches_sync("src/main.rs"));
+        assert!(!groups[0].matcher.matches_sync("src/test/main.rs"));
+    }
+
+    #[test]
+    fn test_load_yaml_bad_glob_is_pattern_error() {
+        let result = PatternLoader::load_yaml_groups("app:\n  - \"src/[\"\n", true);
+        assert!(matches!(result, Err(Error::Pattern(_))));
+    }
+
     // --- files_group_by template tests ---
 
     #[test]
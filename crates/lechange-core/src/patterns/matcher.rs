@@ -1,52 +1,201 @@
 //! Pattern matching with parallel filtering
 
+use crate::cache::LruCache;
 use crate::error::Result;
 use crate::interner::StringInterner;
+#[cfg(windows)]
+use crate::platform::PathUtil;
 use crate::types::ChangedFile;
 use globset::{Glob, GlobSet, GlobSetBuilder};
 use rayon::prelude::*;
+use std::borrow::Cow;
+use std::cell::RefCell;
+use std::collections::HashSet;
+use std::sync::{Arc, OnceLock};
+
+/// Cache key: include patterns, exclude patterns, negation_first
+type MatcherKey = (Vec<String>, Vec<String>, bool);
+
+/// Process-wide cache backing `PatternMatcher::cached`
+static MATCHER_CACHE: OnceLock<LruCache<MatcherKey, Arc<PatternMatcher>>> = OnceLock::new();
+
+fn matcher_cache() -> &'static LruCache<MatcherKey, Arc<PatternMatcher>> {
+    MATCHER_CACHE.get_or_init(|| LruCache::new(PatternMatcher::CACHE_CAPACITY))
+}
+
+/// Process-wide cache of parsed globs, shared by every matcher built here
+static GLOB_CACHE: OnceLock<LruCache<String, Arc<Glob>>> = OnceLock::new();
+
+/// Parsed glob for `pattern`, parsing it only on first use
+///
+/// Pattern groups frequently repeat globs (the same exclude in every YAML
+/// group, say), so each distinct pattern is parsed once per process and
+/// only combined into a `GlobSet` per matcher. Parse errors are not cached.
+fn intern_glob(pattern: &str) -> Result<Arc<Glob>> {
+    let cache = GLOB_CACHE.get_or_init(|| LruCache::new(PatternMatcher::GLOB_CACHE_CAPACITY));
+    if let Some(glob) = cache.get(pattern) {
+        return Ok(glob);
+    }
+
+    let glob = Arc::new(Glob::new(pattern)?);
+    cache.insert(pattern.to_string(), Arc::clone(&glob));
+    Ok(glob)
+}
+
+/// Whether `pattern` contains glob syntax
+///
+/// Patterns without any of `* ? [ { }` (or a `\\` escape) match only the
+/// identical path, so they are checked by a set lookup instead of being
+/// compiled into the `GlobSet`. A stray `}` counts as syntax, so it keeps
+/// whatever meaning (or parse error) `Glob::new` gives it.
+fn has_magic(pattern: &str) -> bool {
+    let bytes = pattern.as_bytes();
+    memchr::memchr3(b'*', b'?', b'[', bytes).is_some()
+        || memchr::memchr3(b'{', b'}', b'\\', bytes).is_some()
+}
+
+/// `path` as globset's `Candidate` sees it, for probing the literal sets
+///
+/// globset normalises `\\` to `/` on Windows before matching, so literal
+/// lookups do the same to agree with the compiled globs.
+#[inline]
+fn literal_candidate(path: &str) -> Cow<'_, str> {
+    #[cfg(windows)]
+    {
+        PathUtil::to_posix(path)
+    }
+    #[cfg(not(windows))]
+    {
+        Cow::Borrowed(path)
+    }
+}
+
+thread_local! {
+    /// Per-thread scratch buffer for the indices of matching globs
+    static MATCH_SCRATCH: RefCell<Vec<usize>> = const { RefCell::new(Vec::new()) };
+}
 
 /// Pattern matcher with precompiled glob patterns
+///
+/// Literal patterns (no glob syntax) live in hash sets. The remaining
+/// includes and excludes are compiled into one `GlobSet` (includes first),
+/// so each path is scanned once and the match indices tell the two apart.
+#[derive(Clone)]
 pub struct PatternMatcher {
-    include_set: GlobSet,
-    exclude_set: GlobSet,
-    negation_first: bool,
+    globs: GlobSet,
+    include_count: usize,
+    include_literals: HashSet<String>,
+    exclude_literals: HashSet<String>,
+    has_includes: bool,
 }
 
 impl PatternMatcher {
     /// Create a new pattern matcher
-    pub fn new(includes: &[&str], excludes: &[&str], negation_first: bool) -> Result<Self> {
-        let mut include_builder = GlobSetBuilder::new();
-        for pattern in includes {
-            include_builder.add(Glob::new(pattern)?);
-        }
+    ///
+    /// For a single path both precedence orders give the same verdict
+    /// (included and not excluded), so `negation_first` does not change
+    /// matching; it only keys entries in the `cached` LRU.
+    pub fn new(includes: &[&str], excludes: &[&str], _negation_first: bool) -> Result<Self> {
+        let mut builder = GlobSetBuilder::new();
+        let mut include_count = 0;
+        let mut include_literals = HashSet::new();
+        let mut exclude_literals = HashSet::new();
 
-        let mut exclude_builder = GlobSetBuilder::new();
-        for pattern in excludes {
-            exclude_builder.add(Glob::new(pattern)?);
+        for (i, pattern) in includes.iter().chain(excludes).enumerate() {
+            let is_include = i < includes.len();
+            if !has_magic(pattern) {
+                let literals = if is_include {
+                    &mut include_literals
+                } else {
+                    &mut exclude_literals
+                };
+                literals.insert(pattern.to_string());
+                continue;
+            }
+
+            let glob = intern_glob(pattern)?;
+            builder.add(Glob::clone(&glob));
+            if is_include {
+                include_count += 1;
+            }
         }
 
         Ok(Self {
-            include_set: include_builder.build()?,
-            exclude_set: exclude_builder.build()?,
-            negation_first,
+            globs: builder.build()?,
+            include_count,
+            include_literals,
+            exclude_literals,
+            has_includes: !includes.is_empty(),
         })
     }
 
+    /// Maximum number of matchers kept by `cached`
+    pub const CACHE_CAPACITY: usize = 1024;
+
+    /// Maximum number of parsed globs shared between matchers
+    pub const GLOB_CACHE_CAPACITY: usize = 4096;
+
+    /// Compiled matcher for these patterns, shared through a process-wide LRU
+    ///
+    /// Equal pattern lists return the same `Arc`, so callers that rebuild
+    /// matchers for every request compile each distinct set only once.
+    /// Compilation errors are not cached.
+    pub fn cached(includes: &[&str], excludes: &[&str], negation_first: bool) -> Result<Arc<Self>> {
+        let key: MatcherKey = (
+            includes.iter().map(|p| p.to_string()).collect(),
+            excludes.iter().map(|p| p.to_string()).collect(),
+            negation_first,
+        );
+
+        let cache = matcher_cache();
+        if let Some(matcher) = cache.get(&key) {
+            return Ok(matcher);
+        }
+
+        let matcher = Arc::new(Self::new(includes, excludes, negation_first)?);
+        cache.insert(key, Arc::clone(&matcher));
+        Ok(matcher)
+    }
+
+    /// Drop every matcher held by the `cached` LRU, and all parsed globs
+    pub fn clear_cache() {
+        if let Some(cache) = MATCHER_CACHE.get() {
+            cache.clear();
+        }
+        if let Some(cache) = GLOB_CACHE.get() {
+            cache.clear();
+        }
+    }
+
     /// Synchronous match for use with rayon - zero allocation
+    ///
+    /// Literal patterns are a hash probe each; the `GlobSet` is only
+    /// scanned when it holds wildcard patterns. A single pass over the
+    /// matching glob indices folds include and exclude hits with `|`
+    /// rather than two short-circuiting `any` scans, and the verdict is
+    /// combined with non-short-circuit `&`. For a single path both
+    /// `negation_first` orders reduce to "included and not excluded", so
+    /// there is no precedence branch either.
     #[inline]
     pub fn matches_sync(&self, path: &str) -> bool {
-        if self.negation_first {
-            if self.exclude_set.is_match(path) {
-                return false;
-            }
-            self.include_set.is_empty() || self.include_set.is_match(path)
-        } else {
-            if !self.include_set.is_empty() && !self.include_set.is_match(path) {
-                return false;
-            }
-            !self.exclude_set.is_match(path)
+        let candidate = literal_candidate(path);
+        let mut include_hit = self.include_literals.contains(&*candidate);
+        let mut exclude_hit = self.exclude_literals.contains(&*candidate);
+
+        if !self.globs.is_empty() {
+            MATCH_SCRATCH.with(|scratch| {
+                let mut hits = scratch.borrow_mut();
+                self.globs.matches_into(path, &mut hits);
+
+                let include_count = self.include_count;
+                for &i in hits.iter() {
+                    include_hit |= i < include_count;
+                    exclude_hit |= i >= include_count;
+                }
+            });
         }
+
+        (include_hit | !self.has_includes) & !exclude_hit
     }
 
     /// Parallel filter using rayon - processes files in parallel
@@ -93,6 +242,35 @@ impl PatternMatcher {
 mod tests {
     use super::*;
 
+    #[test]
+    fn test_cached_shares_compiled_matcher() {
+        let includes = ["cache-test/**/*.rs"];
+        let first = PatternMatcher::cached(&includes, &[], false).unwrap();
+        let second = PatternMatcher::cached(&includes, &[], false).unwrap();
+        assert!(Arc::ptr_eq(&first, &second));
+        assert!(second.matches_sync("cache-test/src/lib.rs"));
+
+        // A different negation order is a different matcher
+        let negated = PatternMatcher::cached(&includes, &[], true).unwrap();
+        assert!(!Arc::ptr_eq(&first, &negated));
+
+        assert!(PatternMatcher::cached(&["[invalid"], &[], false).is_err());
+    }
+
+    #[test]
+    fn test_intern_glob_shares_parsed_glob() {
+        let first = intern_glob("intern-test/**").unwrap();
+        let second = intern_glob("intern-test/**").unwrap();
+        assert!(Arc::ptr_eq(&first, &second));
+        assert!(intern_glob("intern-test/[").is_err());
+
+        // Matchers built from a shared glob still behave independently
+        let a = PatternMatcher::new(&["intern-test/**"], &[], false).unwrap();
+        let b = PatternMatcher::new(&["docs/**"], &["intern-test/**"], false).unwrap();
+        assert!(a.matches_sync("intern-test/x.rs"));
+        assert!(!b.matches_sync("intern-test/x.rs"));
+    }
+
     #[test]
     fn test_basic_matching() {
         let matcher = PatternMatcher::new(&["**/*.rs"], &[], false).unwrap();
@@ -109,4 +287,77 @@ mod tests {
         assert!(matcher.matches_sync("src/main.rs"));
         assert!(!matcher.matches_sync("src/test_utils.rs"));
     }
+
+    #[test]
+    fn test_negation_order_agrees() {
+        let paths = [
+            "src/main.rs",
+            "src/test_utils.rs",
+            "README.md",
+            "docs/test_x.rs",
+        ];
+        let first = PatternMatcher::new(&["**/*.rs"], &["**/test_*.rs"], false).unwrap();
+        let negated = PatternMatcher::new(&["**/*.rs"], &["**/test_*.rs"], true).unwrap();
+        for path in paths {
+            assert_eq!(
+                first.matches_sync(path),
+                negated.matches_sync(path),
+                "{path}"
+            );
+        }
+    }
+
+    #[test]
+    fn test_literal_patterns() {
+        assert!(!has_magic("src/main.rs"));
+        assert!(has_magic("src/*.rs"));
+        assert!(has_magic("src/{a,b}.rs"));
+        assert!(has_magic("src/\\[x\\].rs"));
+        assert!(has_magic("a}b"));
+
+        // A stray `}` is glob syntax: it gets globset's verdict, not a literal lookup
+        let stray = PatternMatcher::new(&["a}b"], &[], false);
+        match Glob::new("a}b") {
+            Ok(glob) => {
+                let glob = glob.compile_matcher();
+                let stray = stray.unwrap();
+                for path in ["a}b", "ab"] {
+                    assert_eq!(stray.matches_sync(path), glob.is_match(path), "{path}");
+                }
+            }
+            Err(_) => assert!(stray.is_err()),
+        }
+
+        let matcher =
+            PatternMatcher::new(&["Cargo.toml", "src/**/*.rs"], &["src/generated.rs"], false)
+                .unwrap();
+        assert!(matcher.matches_sync("Cargo.toml"));
+        assert!(!matcher.matches_sync("crates/Cargo.toml"));
+        assert!(matcher.matches_sync("src/lib.rs"));
+        assert!(!matcher.matches_sync("src/generated.rs"));
+
+        // Literal-only matchers never touch the GlobSet
+        let literal = PatternMatcher::new(&["README.md"], &[], false).unwrap();
+        assert!(literal.matches_sync("README.md"));
+        assert!(!literal.matches_sync("docs/README.md"));
+    }
+
+    #[cfg(windows)]
+    #[test]
+    fn test_literal_patterns_accept_backslash_paths() {
+        // globset normalises `\\` on Windows; literal lookups must agree
+        let matcher = PatternMatcher::new(&["src/main.rs"], &["src/gen.rs"], false).unwrap();
+        assert!(matcher.matches_sync("src\\main.rs"));
+        assert!(!matcher.matches_sync("src\\gen.rs"));
+    }
+
+    #[test]
+    fn test_excludes_only() {
+        // No includes: everything matches except the excluded paths
+        for negation_first in [false, true] {
+            let matcher = PatternMatcher::new(&[], &["docs/**"], negation_first).unwrap();
+            assert!(matcher.matches_sync("src/main.rs"));
+            assert!(!matcher.matches_sync("docs/index.md"));
+        }
+    }
 }
@@ -1,7 +1,37 @@
 //! Platform-specific utilities
 
+use std::borrow::Cow;
 use std::path::MAIN_SEPARATOR;
 
+/// `0x7F` in every byte lane of a `u64`
+const LANES_7F: u64 = u64::from_ne_bytes([0x7F; 8]);
+/// `\` in every byte lane of a `u64`
+const LANES_BACKSLASH: u64 = u64::from_ne_bytes([b'\\'; 8]);
+
+/// Replace every `\` byte with `/`, eight bytes at a time
+///
+/// XOR against a word of backslashes zeroes exactly the matching lanes;
+/// the carry-free zero test below turns those lanes into `0x01`, and
+/// multiplying by `\ ^ /` yields the per-lane toggle, with no branches.
+#[inline]
+fn replace_backslashes(bytes: &mut [u8]) {
+    let mut chunks = bytes.chunks_exact_mut(8);
+    for chunk in &mut chunks {
+        let mut word = [0u8; 8];
+        word.copy_from_slice(chunk);
+        let word = u64::from_ne_bytes(word);
+        let eq = word ^ LANES_BACKSLASH;
+        let zero_lanes = !(((eq & LANES_7F) + LANES_7F) | eq | LANES_7F);
+        let toggle = (zero_lanes >> 7) * u64::from(b'\\' ^ b'/');
+        chunk.copy_from_slice(&(word ^ toggle).to_ne_bytes());
+    }
+    for byte in chunks.into_remainder() {
+        if *byte == b'\\' {
+            *byte = b'/';
+        }
+    }
+}
+
 /// Platform-aware path utilities with zero allocation where possible
 pub struct PathUtil;
 
@@ -25,34 +55,50 @@ impl PathUtil {
     /// Check if path contains any separator
     #[inline]
     pub fn has_separator(path: &str) -> bool {
-        path.contains('/') || path.contains('\\')
+        memchr::memchr2(b'/', b'\\', path.as_bytes()).is_some()
     }
 
     /// Split path by any separator (zero-copy iterator)
+    ///
+    /// Separators are located with `memchr2`, which scans a vector register
+    /// of bytes per step instead of testing each char against both.
     #[inline]
     pub fn components(path: &str) -> impl Iterator<Item = &str> {
-        path.split(['/', '\\']).filter(|s| !s.is_empty())
+        let mut start = 0;
+        memchr::memchr2_iter(b'/', b'\\', path.as_bytes())
+            .chain(std::iter::once(path.len()))
+            .filter_map(move |end| {
+                let part = &path[start..end];
+                start = end + 1;
+                (!part.is_empty()).then_some(part)
+            })
     }
 
     /// Convert path to POSIX format (forward slashes)
     ///
     /// No-op on Unix (returns borrowed), replaces `\` on Windows.
     #[inline]
-    pub fn to_posix(path: &str) -> std::borrow::Cow<'_, str> {
-        if cfg!(windows) || path.contains('\\') {
-            std::borrow::Cow::Owned(path.replace('\\', "/"))
-        } else {
-            std::borrow::Cow::Borrowed(path)
-        }
+    pub fn to_posix(path: &str) -> Cow<'_, str> {
+        let first = match memchr::memchr(b'\\', path.as_bytes()) {
+            Some(first) => first,
+            None if cfg!(windows) => return Cow::Owned(path.to_string()),
+            None => return Cow::Borrowed(path),
+        };
+
+        let mut bytes = path.as_bytes().to_vec();
+        replace_backslashes(&mut bytes[first..]);
+        // SAFETY: only ASCII `\` bytes were rewritten, to ASCII `/`; UTF-8
+        // continuation bytes are all >= 0x80, so the buffer is still UTF-8
+        Cow::Owned(unsafe { String::from_utf8_unchecked(bytes) })
     }
 
     /// Apply separator to path based on config
     #[inline]
-    pub fn with_separator(path: &str, use_posix: bool) -> std::borrow::Cow<'_, str> {
+    pub fn with_separator(path: &str, use_posix: bool) -> Cow<'_, str> {
         if use_posix {
             Self::to_posix(path)
         } else {
-            std::borrow::Cow::Borrowed(path)
+            Cow::Borrowed(path)
         }
     }
 }
@@ -75,6 +121,14 @@ mod tests {
 
         let parts: Vec<&str> = PathUtil::components("foo\\bar\\baz").collect();
         assert_eq!(parts, vec!["foo", "bar", "baz"]);
+
+        let parts: Vec<&str> = PathUtil::components("/foo\\\\bar//baz/").collect();
+        assert_eq!(parts, vec!["foo", "bar", "baz"]);
+
+        assert_eq!(PathUtil::components("").count(), 0);
+        assert_eq!(PathUtil::components("/\\/").count(), 0);
+        let parts: Vec<&str> = PathUtil::components("données/日本").collect();
+        assert_eq!(parts, vec!["données", "日本"]);
     }
 
     #[test]
@@ -109,6 +163,34 @@ mod tests {
         assert_eq!(result.as_ref(), "already/posix/path");
     }
 
+    #[test]
+    fn test_to_posix_matches_scalar_replace() {
+        // Cover every lane position, the scalar tail, and neighbours of `\`
+        // in byte value (`[`, `]`) and in UTF-8 (multi-byte characters)
+        let samples = [
+            "\\",
+            "a\\b",
+            "\\\\\\\\\\\\\\\\\\",
+            "dir]\\[x]\\y\\z\\0123456789",
+            "données\\日本\\файл.txt",
+            "]]]]]]]]\\]]]]]]]",
+        ];
+        for sample in samples {
+            for offset in 0..9 {
+                let path = format!("{}{}", "p".repeat(offset), sample);
+                assert_eq!(PathUtil::to_posix(&path), path.replace('\\', "/"));
+            }
+        }
+    }
+
+    #[test]
+    fn test_has_separator_either_kind() {
+        assert!(PathUtil::has_separator("/"));
+        assert!(PathUtil::has_separator("a-very-long-file-name\\x"));
+        assert!(!PathUtil::has_separator(""));
+        assert!(!PathUtil::has_separator("a-very-long-file-name.rs"));
+    }
+
     #[test]
     fn test_with_separator_posix_true() {
         let result = PathUtil::with_separator("foo\\bar", true);
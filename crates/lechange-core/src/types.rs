@@ -96,7 +96,7 @@ pub struct ChangedFile {
 }
 
 /// Result of a diff operation - owns minimal data
-#[derive(Debug, Default)]
+#[derive(Debug, Clone, Default)]
 pub struct DiffResult {
     /// All changed files
     pub files: Vec<ChangedFile>,
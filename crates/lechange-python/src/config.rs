@@ -1,110 +1,184 @@
 //! Configuration type conversions
 
+use lechange_core::patterns::matcher::PatternMatcher;
 use pyo3::prelude::*;
 use std::borrow::Cow;
+use std::sync::Arc;
+
+/// Whether `rev` is a full hex object ID (no ref lookup needed)
+pub(crate) fn is_full_sha(rev: &str) -> bool {
+    rev.len() == 40 && rev.bytes().all(|b| b.is_ascii_hexdigit())
+}
 
 /// Python configuration wrapper
-#[pyclass(name = "Config")]
+///
+/// Immutable once constructed: fields are readable from Python, and
+/// detectors borrow the config directly instead of copying it per call.
+/// `token` is deliberately not exposed.
+#[pyclass(name = "Config", frozen)]
 #[derive(Clone)]
 pub struct PyConfig {
     // SHA configuration
+    #[pyo3(get)]
     pub base_sha: Option<String>,
+    #[pyo3(get)]
     pub sha: Option<String>,
+    #[pyo3(get)]
     pub since: Option<String>,
+    #[pyo3(get)]
     pub until: Option<String>,
 
     // Pattern configuration
+    #[pyo3(get)]
     pub files: Option<Vec<String>>,
+    #[pyo3(get)]
     pub files_separator: String,
+    #[pyo3(get)]
     pub files_ignore: Option<Vec<String>>,
+    #[pyo3(get)]
     pub files_ignore_separator: String,
 
     // YAML patterns
+    #[pyo3(get)]
     pub files_yaml: Option<String>,
+    #[pyo3(get)]
     pub files_yaml_from_source_file: Option<String>,
+    #[pyo3(get)]
     pub files_from_source_file: Option<String>,
+    #[pyo3(get)]
     pub files_from_source_file_separator: String,
 
     // Diff configuration
+    #[pyo3(get)]
     pub diff_filter: String,
+    #[pyo3(get)]
     pub include_all_old_new_renamed_files: bool,
+    #[pyo3(get)]
     pub old_new_separator: String,
+    #[pyo3(get)]
     pub old_new_files_separator: String,
 
     // Directory configuration
+    #[pyo3(get)]
     pub dir_names: bool,
+    #[pyo3(get)]
     pub dir_names_max_depth: Option<u32>,
+    #[pyo3(get)]
     pub quotepath: bool,
+    #[pyo3(get)]
     pub path_separator: String,
 
     // Directory extras
+    #[pyo3(get)]
     pub dir_names_exclude_current_dir: bool,
+    #[pyo3(get)]
     pub dir_names_include_files: Option<Vec<String>>,
+    #[pyo3(get)]
     pub dir_names_deleted_files_include_only_deleted_dirs: bool,
 
     // Submodule configuration
+    #[pyo3(get)]
     pub include_submodules: bool,
+    #[pyo3(get)]
     pub submodule_filter: Option<String>,
 
     // Fetch configuration
+    #[pyo3(get)]
     pub fetch_depth: u32,
+    #[pyo3(get)]
     pub fetch_additional_submodule_history: bool,
 
     // Output configuration
+    #[pyo3(get)]
     pub json: bool,
+    #[pyo3(get)]
     pub escape_json: bool,
+    #[pyo3(get)]
     pub safe_output: bool,
+    #[pyo3(get)]
     pub output_dir: Option<String>,
 
     // API configuration
+    #[pyo3(get)]
     pub skip_initial_fetch: bool,
+    #[pyo3(get)]
     pub use_rest_api: bool,
+    #[pyo3(get)]
     pub api_url: Option<String>,
     pub token: Option<String>,
 
     // Other configuration
+    #[pyo3(get)]
     pub write_output_files: bool,
+    #[pyo3(get)]
     pub negation_patterns_first: bool,
+    #[pyo3(get)]
     pub match_gitignore_files: bool,
+    #[pyo3(get)]
     pub recover_deleted_files: bool,
+    #[pyo3(get)]
     pub exclude_symlinks: bool,
 
     // Tag comparison
+    #[pyo3(get)]
     pub tags_pattern: Option<String>,
+    #[pyo3(get)]
     pub tags_ignore_pattern: Option<String>,
 
     // Soft-fail
+    #[pyo3(get)]
     pub fail_on_initial_diff_error: bool,
+    #[pyo3(get)]
     pub fail_on_submodule_diff_error: bool,
+    #[pyo3(get)]
     pub skip_same_sha: bool,
 
     // Rename splitting / POSIX
+    #[pyo3(get)]
     pub output_renamed_as_deleted_added: bool,
+    #[pyo3(get)]
     pub use_posix_path_separator: bool,
 
     // Workflow failure tracking configuration
+    #[pyo3(get)]
     pub track_workflow_failures: bool,
+    #[pyo3(get)]
     pub workflow_lookback_commits: u32,
+    #[pyo3(get)]
     pub wait_for_active_workflows: bool,
+    #[pyo3(get)]
     pub workflow_max_wait_seconds: u32,
+    #[pyo3(get)]
     pub include_failed_files: bool,
 
     // Workflow intelligence (enhanced)
+    #[pyo3(get)]
     pub failure_tracking_level: Option<String>,
+    #[pyo3(get)]
     pub workflow_success_lookback: u32,
+    #[pyo3(get)]
     pub skip_successful_files: bool,
+    #[pyo3(get)]
     pub workflow_name_filter: Option<String>,
 
     // Group-by discovery
+    #[pyo3(get)]
     pub files_group_by: Option<String>,
+    #[pyo3(get)]
     pub files_group_by_key: Option<String>,
 
     // Ancestor directory file association
+    #[pyo3(get)]
     pub files_ancestor_lookup_depth: u32,
 
     // Deploy matrix enrichment
+    #[pyo3(get)]
     pub deploy_matrix_include_reason: bool,
+    #[pyo3(get)]
     pub deploy_matrix_include_concurrency: bool,
+
+    // Inline patterns compiled once at construction
+    pattern_matcher: Option<Arc<PatternMatcher>>,
 }
 
 #[pymethods]
@@ -171,7 +245,10 @@ impl PyConfig {
         files_group_by_key=None,
         files_ancestor_lookup_depth=None,
         deploy_matrix_include_reason=None,
-        deploy_matrix_include_concurrency=None
+        deploy_matrix_include_concurrency=None,
+        *,
+        base=None,
+        head=None
     ))]
     #[allow(clippy::too_many_arguments)]
     fn new(
@@ -236,10 +313,13 @@ impl PyConfig {
         files_ancestor_lookup_depth: Option<u32>,
         deploy_matrix_include_reason: Option<bool>,
         deploy_matrix_include_concurrency: Option<bool>,
+        base: Option<String>,
+        head: Option<String>,
     ) -> Self {
-        Self {
-            base_sha,
-            sha,
+        // `base`/`head` are aliases; the explicit `base_sha`/`sha` win
+        let mut config = Self {
+            base_sha: base_sha.or(base),
+            sha: sha.or(head),
             since,
             until,
             files,
@@ -301,7 +381,10 @@ impl PyConfig {
             files_ancestor_lookup_depth: files_ancestor_lookup_depth.unwrap_or(0),
             deploy_matrix_include_reason: deploy_matrix_include_reason.unwrap_or(false),
             deploy_matrix_include_concurrency: deploy_matrix_include_concurrency.unwrap_or(false),
-        }
+            pattern_matcher: None,
+        };
+        config.pattern_matcher = config.compile_inline_patterns();
+        config
     }
 
     fn __repr__(&self) -> String {
@@ -313,6 +396,65 @@ impl PyConfig {
 }
 
 impl PyConfig {
+    /// Whether `skip_same_sha` applies without resolving anything
+    ///
+    /// True only when both SHAs are the same full object ID and nothing
+    /// else decides the range: `use_rest_api` bypasses SHA resolution and
+    /// `until` takes priority over `sha`. Refs, abbreviated SHAs and every
+    /// other case go through the core, which validates them and compares
+    /// after resolution.
+    pub fn is_trivially_same_sha(&self) -> bool {
+        self.skip_same_sha
+            && !self.use_rest_api
+            && self.until.is_none()
+            && matches!(
+                (&self.base_sha, &self.sha),
+                (Some(base), Some(head)) if base == head && is_full_sha(head)
+            )
+    }
+
+    /// Copy of this config with different inline patterns
+    ///
+    /// `files_ignore` is only replaced when given.
+    pub fn with_patterns(&self, files: Vec<String>, files_ignore: Option<Vec<String>>) -> Self {
+        let mut config = self.clone();
+        config.files = Some(files);
+        if files_ignore.is_some() {
+            config.files_ignore = files_ignore;
+        }
+        config.pattern_matcher = config.compile_inline_patterns();
+        config
+    }
+
+    /// Matcher compiled from the inline patterns, if they are the only pattern source
+    pub fn pattern_matcher(&self) -> Option<&PatternMatcher> {
+        self.pattern_matcher.as_deref()
+    }
+
+    /// Compile inline `files`/`files_ignore` so detections skip glob parsing
+    ///
+    /// Returns `None` when patterns are also read from files at detection
+    /// time, or when compilation fails; the detection call then builds the
+    /// matcher itself and reports the error.
+    fn compile_inline_patterns(&self) -> Option<Arc<PatternMatcher>> {
+        if self.files_from_source_file.is_some() || self.match_gitignore_files {
+            return None;
+        }
+
+        let includes: Vec<&str> = self.files.as_ref()?.iter().map(String::as_str).collect();
+        if includes.is_empty() {
+            return None;
+        }
+        let excludes: Vec<&str> = self
+            .files_ignore
+            .iter()
+            .flatten()
+            .map(String::as_str)
+            .collect();
+
+        PatternMatcher::cached(&includes, &excludes, self.negation_patterns_first).ok()
+    }
+
     /// Convert to core InputConfig (zero-copy: borrows from self)
     pub fn to_core_config(&self) -> lechange_core::InputConfig<'_> {
         lechange_core::InputConfig {
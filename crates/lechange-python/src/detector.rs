@@ -1,17 +1,88 @@
 //! Main detector wrapper
 
-use crate::config::PyConfig;
+use crate::config::{is_full_sha, PyConfig};
 use crate::result::PyChangedFiles;
-use crate::runtime::block_on_runtime;
+use crate::runtime::{block_on_runtime, future_into_py};
+use lechange_core::coordination::processor::FileProcessor;
+use lechange_core::git::{DiffCache, GitRepository};
 use lechange_core::output::computed::ComputedOutputs;
-use lechange_core::StringInterner;
+use lechange_core::types::{Diagnostic, DiagnosticCategory, DiagnosticSeverity, InputConfig};
+use lechange_core::{ProcessedResult, StringInterner};
+use once_cell::sync::OnceCell;
 use pyo3::prelude::*;
+use std::borrow::Cow;
+use std::collections::HashMap;
 use std::path::PathBuf;
+use std::sync::{Arc, Mutex};
+
+/// State shared by every call on one detector
+///
+/// The repository is discovered on first use. The interner and diff cache
+/// live as long as the detector, so repeated calls against the same
+/// (base, head) pair only diff the trees once. Symbolic revisions are
+/// resolved once and remembered until `refresh()`.
+struct DetectorState {
+    repo_path: PathBuf,
+    repo: OnceCell<GitRepository>,
+    interner: StringInterner,
+    diff_cache: DiffCache,
+    resolved_refs: Mutex<HashMap<String, String>>,
+}
+
+impl DetectorState {
+    /// Repository handle, discovered from `repo_path` on first use
+    fn repo(&self) -> lechange_core::Result<&GitRepository> {
+        self.repo
+            .get_or_try_init(|| GitRepository::discover(&self.repo_path))
+    }
+
+    /// Resolve a revision to its full SHA, consulting the ref cache first
+    fn resolve(&self, rev: &str) -> lechange_core::Result<String> {
+        if let Some(sha) = self.lock_refs().get(rev) {
+            return Ok(sha.clone());
+        }
+        let sha = self.repo()?.resolve_sha_sync(rev)?;
+        self.lock_refs().insert(rev.to_string(), sha.clone());
+        Ok(sha)
+    }
+
+    /// Core config for `config`, with symbolic base/head revisions resolved
+    ///
+    /// Full SHAs pass through untouched; the core validates those itself.
+    /// Only revisions the core will read are resolved: none under
+    /// `use_rest_api`, and not `sha` when `until` picks the head. `base_sha`
+    /// takes priority over `since` in the core, so it is read whenever set.
+    fn core_config<'c>(&self, config: &'c PyConfig) -> lechange_core::Result<InputConfig<'c>> {
+        let mut core_config = config.to_core_config();
+        if config.use_rest_api {
+            return Ok(core_config);
+        }
+
+        let head = if config.until.is_none() {
+            Some(&mut core_config.sha)
+        } else {
+            None
+        };
+        for rev in std::iter::once(&mut core_config.base_sha).chain(head) {
+            if let Some(value) = rev.as_deref().filter(|value| !is_full_sha(value)) {
+                *rev = Some(Cow::Owned(self.resolve(value)?));
+            }
+        }
+        Ok(core_config)
+    }
+
+    fn lock_refs(&self) -> std::sync::MutexGuard<'_, HashMap<String, String>> {
+        // The map is always left consistent, so a poisoned lock is still usable
+        self.resolved_refs
+            .lock()
+            .unwrap_or_else(|poisoned| poisoned.into_inner())
+    }
+}
 
 /// Python change detector wrapper
 #[pyclass(name = "ChangeDetector")]
 pub struct PyChangeDetector {
-    repo_path: PathBuf,
+    state: Arc<DetectorState>,
 }
 
 #[pymethods]
@@ -30,70 +101,267 @@ impl PyChangeDetector {
             )));
         }
 
-        Ok(Self { repo_path: path })
+        Ok(Self {
+            state: Arc::new(DetectorState {
+                repo_path: path,
+                repo: OnceCell::new(),
+                interner: StringInterner::with_capacity(2048),
+                diff_cache: DiffCache::default(),
+                resolved_refs: Mutex::new(HashMap::new()),
+            }),
+        })
+    }
+
+    fn get_changed_files(&self, config: Py<PyConfig>) -> PyResult<PyChangedFiles> {
+        let state = Arc::clone(&self.state);
+
+        // Detection and result building both run without the GIL; only the
+        // finished ChangedFiles crosses back into Python
+        block_on_runtime(async move {
+            let config = config.get();
+            let (processed, outputs) = detect(&state, config).await?;
+            Ok(to_py_result(processed, &outputs, &state.interner, config))
+        })
     }
 
-    fn get_changed_files(&self, config: PyConfig) -> PyResult<PyChangedFiles> {
-        let repo_path = self.repo_path.clone();
-        // Extract Copy fields before moving config into async block
-        let json = config.json;
-        let use_posix = config.use_posix_path_separator;
-        let include_reason = config.deploy_matrix_include_reason;
-        let include_concurrency = config.deploy_matrix_include_concurrency;
+    /// Awaitable variant of `get_changed_files`
+    ///
+    /// Detection runs on the shared Tokio runtime without holding the GIL,
+    /// so concurrent awaits proceed in parallel.
+    fn get_changed_files_async<'py>(
+        &self,
+        py: Python<'py>,
+        config: Py<PyConfig>,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let state = Arc::clone(&self.state);
 
-        // Execute the detection — config is moved into the async block
-        // so to_core_config() can borrow from it (zero-copy)
-        let result = block_on_runtime(async move {
-            let core_config = config.to_core_config();
+        future_into_py(py, async move {
+            let config = config.get();
+            let (processed, outputs) = detect(&state, config).await?;
+            Ok(to_py_result(processed, &outputs, &state.interner, config))
+        })
+    }
 
-            // Initialize interner
-            let interner = StringInterner::with_capacity(2048);
+    /// Run detection for several configs in a single call.
+    ///
+    /// The repository is discovered once and every config is processed
+    /// inside one runtime entry, so N ranges cost one Python→Rust crossing
+    /// instead of N. Results are returned in the same order as `configs`.
+    fn get_changed_files_batch(&self, configs: Vec<Py<PyConfig>>) -> PyResult<Vec<PyChangedFiles>> {
+        self.detect_batch(configs)
+    }
 
-            // Open repository
-            let repo = lechange_core::git::GitRepository::discover(&repo_path)?;
+    /// Awaitable variant of `get_changed_files_batch`
+    ///
+    /// The whole batch runs as one task on the shared runtime, so awaiting
+    /// it neither blocks the event loop nor occupies a thread-pool worker.
+    fn get_changed_files_batch_async<'py>(
+        &self,
+        py: Python<'py>,
+        configs: Vec<Py<PyConfig>>,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let state = Arc::clone(&self.state);
+        future_into_py(py, async move { detect_all(&state, &configs).await })
+    }
 
-            // Ensure depth if needed
-            if core_config.fetch_depth > 0 {
-                repo.ensure_depth(core_config.fetch_depth).await?;
+    /// Apply several pattern sets to one range, diffing it only once
+    ///
+    /// `config` supplies the range and every other option. Each entry of
+    /// `pattern_sets` is either a list of `files` patterns or a
+    /// `(files, files_ignore)` pair; it replaces the config's inline patterns
+    /// for that result. Results are returned in the same order.
+    fn get_changed_files_multi(
+        &self,
+        py: Python<'_>,
+        config: &PyConfig,
+        pattern_sets: Vec<PatternSet>,
+    ) -> PyResult<Vec<PyChangedFiles>> {
+        let configs = pattern_sets
+            .into_iter()
+            .map(|set| {
+                let derived = match set {
+                    PatternSet::Files(files) => config.with_patterns(files, None),
+                    PatternSet::FilesAndIgnore((files, ignore)) => {
+                        config.with_patterns(files, Some(ignore))
+                    }
+                };
+                Py::new(py, derived)
+            })
+            .collect::<PyResult<_>>()?;
+        self.detect_batch(configs)
+    }
+
+    /// Whether any file in the range passes the config's patterns
+    ///
+    /// Same answer as `get_changed_files(config).any_changed`, but for plain
+    /// diff + pattern configs the diff walk stops at the first match and no
+    /// result object is built.
+    fn any_changed(&self, config: Py<PyConfig>) -> PyResult<bool> {
+        let state = Arc::clone(&self.state);
+
+        block_on_runtime(async move {
+            let config = config.get();
+            if config.is_trivially_same_sha() {
+                return Ok(false);
             }
 
-            // Create processor and run
-            let processor = lechange_core::coordination::processor::FileProcessor::new(
-                &repo,
-                &interner,
-                &core_config,
-            );
-
-            let processed = processor.process().await?;
-
-            // Compute derived outputs (with rename splitting + concurrency support)
-            let blocked_groups = processed
-                .workflow_result
-                .as_ref()
-                .map(|wr| &wr.blocked_groups);
-            let outputs = ComputedOutputs::compute_with_concurrency(
-                &processed,
-                core_config.output_renamed_as_deleted_added,
-                blocked_groups,
-                Some(&interner),
-            );
-
-            Ok((processed, outputs, interner))
-        })?;
-
-        let (processed, outputs, interner) = result;
-        Ok(PyChangedFiles::from_core(
-            processed,
-            &outputs,
-            &interner,
-            json,
-            use_posix,
-            include_reason,
-            include_concurrency,
-        ))
+            // Deepen before resolving, so `HEAD~N` can reach past a shallow clone
+            let repo = state.repo()?;
+            if config.fetch_depth > 0 {
+                repo.ensure_depth(config.fetch_depth).await?;
+            }
+            let core_config = state.core_config(config)?;
+
+            let mut processor = FileProcessor::new(repo, &state.interner, &core_config)
+                .with_diff_cache(&state.diff_cache);
+            if let Some(matcher) = config.pattern_matcher() {
+                processor = processor.with_pattern_matcher(matcher);
+            }
+            processor.any_changed().await
+        })
+    }
+
+    /// Resolve a revision (SHA, branch, tag, `HEAD~3`, ...) to its full commit SHA
+    ///
+    /// Results are cached per detector until `refresh()`. Symbolic
+    /// `base_sha`/`sha` values in a `Config` go through the same cache.
+    fn resolve(&self, py: Python<'_>, rev: &str) -> PyResult<String> {
+        py.detach(|| self.state.resolve(rev))
+            .map_err(|e| PyErr::new::<crate::error::GitError, _>(format!("{}", e)))
+    }
+
+    /// SHAs of every commit reachable from `rev`, oldest first
+    ///
+    /// Walks history in-process with libgit2, so callers (test fixtures,
+    /// release tooling) need not spawn `git log --reverse` and parse it.
+    #[pyo3(signature = (rev = "HEAD"))]
+    fn commit_shas(&self, py: Python<'_>, rev: &str) -> PyResult<Vec<String>> {
+        py.detach(|| self.state.repo()?.commit_shas_sync(rev))
+            .map_err(|e| PyErr::new::<crate::error::GitError, _>(format!("{}", e)))
+    }
+
+    /// Forget resolved revisions so moved refs (fetches, new commits) are re-read
+    fn refresh(&self) {
+        self.state.lock_refs().clear();
+    }
+
+    /// Drop all cached diffs held by this detector
+    fn clear_cache(&self) {
+        self.state.diff_cache.clear();
     }
 
     fn __repr__(&self) -> String {
-        format!("ChangeDetector(repo_path={})", self.repo_path.display())
+        format!(
+            "ChangeDetector(repo_path={})",
+            self.state.repo_path.display()
+        )
+    }
+}
+
+impl PyChangeDetector {
+    /// Detect every config in one runtime entry; later configs on the same
+    /// range reuse the cached diff
+    fn detect_batch(&self, configs: Vec<Py<PyConfig>>) -> PyResult<Vec<PyChangedFiles>> {
+        let state = Arc::clone(&self.state);
+        block_on_runtime(async move { detect_all(&state, &configs).await })
+    }
+}
+
+/// One entry of `get_changed_files_multi`'s `pattern_sets`
+#[derive(FromPyObject)]
+enum PatternSet {
+    Files(Vec<String>),
+    FilesAndIgnore((Vec<String>, Vec<String>)),
+}
+
+/// Run `detect` for each config in order, building every result
+async fn detect_all(
+    state: &DetectorState,
+    configs: &[Py<PyConfig>],
+) -> lechange_core::Result<Vec<PyChangedFiles>> {
+    let mut results = Vec::with_capacity(configs.len());
+    for config in configs.iter().map(Py::get) {
+        let (processed, outputs) = detect(state, config).await?;
+        results.push(to_py_result(processed, &outputs, &state.interner, config));
+    }
+    Ok(results)
+}
+
+/// Run the full detection pipeline for one config
+async fn detect(
+    state: &DetectorState,
+    config: &PyConfig,
+) -> lechange_core::Result<(ProcessedResult, ComputedOutputs)> {
+    // Textually identical SHAs need no git work at all
+    if config.is_trivially_same_sha() {
+        return Ok(skipped_same_sha(config, &state.interner));
     }
+
+    let repo = state.repo()?;
+
+    // Ensure depth if needed, before symbolic revisions such as `HEAD~5`
+    // are resolved against a possibly shallow history
+    if config.fetch_depth > 0 {
+        repo.ensure_depth(config.fetch_depth).await?;
+    }
+    let core_config = state.core_config(config)?;
+
+    // Create processor and run
+    let mut processor =
+        FileProcessor::new(repo, &state.interner, &core_config).with_diff_cache(&state.diff_cache);
+    if let Some(matcher) = config.pattern_matcher() {
+        processor = processor.with_pattern_matcher(matcher);
+    }
+    let processed = processor.process().await?;
+
+    // Compute derived outputs (with rename splitting + concurrency support)
+    let blocked_groups = processed
+        .workflow_result
+        .as_ref()
+        .map(|wr| &wr.blocked_groups);
+    let outputs = ComputedOutputs::compute_with_concurrency(
+        &processed,
+        core_config.output_renamed_as_deleted_added,
+        blocked_groups,
+        Some(&state.interner),
+    );
+
+    Ok((processed, outputs))
+}
+
+/// Empty result carrying the same diagnostic the core emits for identical SHAs
+fn skipped_same_sha(
+    config: &PyConfig,
+    interner: &StringInterner,
+) -> (ProcessedResult, ComputedOutputs) {
+    let mut processed = ProcessedResult::default();
+    processed.diagnostics.push(Diagnostic {
+        severity: DiagnosticSeverity::Warning,
+        category: DiagnosticCategory::SkippedSameSha,
+        message: format!(
+            "Skipped: base and head SHA are identical ({})",
+            config.sha.as_deref().unwrap_or_default()
+        ),
+    });
+    let outputs =
+        ComputedOutputs::compute_with_concurrency(&processed, false, None, Some(interner));
+    (processed, outputs)
+}
+
+/// Convert a core result into the Python result type using the config's output options
+fn to_py_result(
+    processed: ProcessedResult,
+    outputs: &ComputedOutputs,
+    interner: &StringInterner,
+    config: &PyConfig,
+) -> PyChangedFiles {
+    PyChangedFiles::from_core(
+        processed,
+        outputs,
+        interner,
+        config.json,
+        config.use_posix_path_separator,
+        config.deploy_matrix_include_reason,
+        config.deploy_matrix_include_concurrency,
+    )
 }
@@ -1,6 +1,7 @@
 //! Error handling for Python bindings
 
-use pyo3::exceptions::PyException;
+use lechange_core::Error;
+use pyo3::exceptions::{PyException, PyOSError};
 use pyo3::prelude::*;
 
 pyo3::create_exception!(lechange, LeChangeError, PyException);
@@ -27,3 +28,21 @@ pub fn register_exceptions(module: &Bound<'_, PyModule>) -> PyResult<()> {
     )?;
     Ok(())
 }
+
+/// Convert a core error into the matching `lechange` exception
+///
+/// I/O failures surface as `OSError`; errors without a dedicated class
+/// (HTTP, workflow API, runtime) become `lechange.RuntimeError`.
+pub fn core_error_to_py(e: Error) -> PyErr {
+    let message = e.to_string();
+    match e {
+        Error::Git(_) => PyErr::new::<GitError, _>(message),
+        Error::Config(_) | Error::Pattern(_) => PyErr::new::<ConfigError, _>(message),
+        Error::InvalidPath(_) => PyErr::new::<PathError, _>(message),
+        Error::Io(_) => PyErr::new::<PyOSError, _>(message),
+        Error::Recovery(_) => PyErr::new::<RecoveryError, _>(message),
+        Error::Yaml(_) => PyErr::new::<YamlError, _>(message),
+        Error::ShallowExhausted(_) => PyErr::new::<ShallowCloneError, _>(message),
+        _ => PyErr::new::<RuntimeError, _>(message),
+    }
+}
@@ -7,6 +7,7 @@ mod detector;
 mod error;
 mod format_utils;
 mod output_writer;
+mod path_list;
 mod path_util;
 mod pattern_loader;
 pub(crate) mod pattern_matcher;
@@ -18,6 +19,11 @@ pub use config::PyConfig;
 pub use detector::PyChangeDetector;
 pub use result::PyChangedFiles;
 
+/// Detection allocates many short-lived path, SHA and pattern strings;
+/// mimalloc handles that churn with less overhead than the system malloc
+#[global_allocator]
+static GLOBAL: mimalloc::MiMalloc = mimalloc::MiMalloc;
+
 /// LeChange Python module
 #[pymodule]
 fn _lechange(module: &Bound<'_, PyModule>) -> PyResult<()> {
@@ -25,6 +31,7 @@ fn _lechange(module: &Bound<'_, PyModule>) -> PyResult<()> {
     module.add_class::<PyChangeDetector>()?;
     module.add_class::<PyConfig>()?;
     module.add_class::<PyChangedFiles>()?;
+    module.add_class::<path_list::PyChangedFilesView>()?;
     module.add_class::<pattern_matcher::PyPatternMatcher>()?;
     module.add_class::<path_util::PyPathUtil>()?;
     module.add_class::<recovery::PyFileRecovery>()?;
@@ -1,6 +1,7 @@
 //! Python bindings for OutputWriter
 
-use lechange_core::output::writer::OutputWriter;
+use lechange_core::output::writer::{OutputFile, OutputFormat, OutputWriter};
+use pyo3::exceptions::{PyOSError, PyValueError};
 use pyo3::prelude::*;
 use std::path::Path;
 
@@ -36,6 +37,52 @@ impl PyOutputWriter {
             .map_err(|e| PyErr::new::<pyo3::exceptions::PyOSError, _>(format!("{}", e)))
     }
 
+    /// Write several output files in one call
+    ///
+    /// Each entry is `(name, values, ext)` with `ext` either `"txt"` (values
+    /// joined by `separator`) or `"json"`. Files are written in parallel
+    /// without holding the GIL; every entry is attempted, then the first
+    /// failure in entry order is raised as `OSError`.
+    #[staticmethod]
+    #[pyo3(signature = (output_dir, entries, separator = "\n"))]
+    fn write_batch(
+        py: Python<'_>,
+        output_dir: &str,
+        entries: Vec<(String, Vec<String>, String)>,
+        separator: &str,
+    ) -> PyResult<()> {
+        let formats = entries
+            .iter()
+            .map(|(_, _, ext)| match ext.as_str() {
+                "txt" => Ok(OutputFormat::Text { separator }),
+                "json" => Ok(OutputFormat::Json),
+                other => Err(PyValueError::new_err(format!(
+                    "Unknown output extension '{}' (expected 'txt' or 'json')",
+                    other
+                ))),
+            })
+            .collect::<PyResult<Vec<_>>>()?;
+        let values: Vec<Vec<&str>> = entries
+            .iter()
+            .map(|(_, values, _)| values.iter().map(|s| s.as_str()).collect())
+            .collect();
+        let files: Vec<OutputFile<'_>> = entries
+            .iter()
+            .zip(&values)
+            .zip(formats)
+            .map(|(((name, _, _), values), format)| OutputFile {
+                name,
+                values,
+                format,
+            })
+            .collect();
+
+        py.detach(|| OutputWriter::write_batch(Path::new(output_dir), &files))
+            .into_iter()
+            .collect::<lechange_core::Result<()>>()
+            .map_err(|e| PyErr::new::<PyOSError, _>(format!("{}", e)))
+    }
+
     fn __repr__(&self) -> String {
         "OutputWriter()".to_string()
     }
@@ -0,0 +1,234 @@
+//! Packed path storage and lazy sequence views over it
+
+use pyo3::exceptions::PyIndexError;
+use pyo3::prelude::*;
+use pyo3::pybacked::PyBackedStr;
+use pyo3::types::{PyBool, PyBytes, PyList, PyMemoryView, PySlice, PyString};
+use std::sync::Arc;
+
+/// Paths packed into one UTF-8 buffer plus an offset table
+///
+/// Path `i` is `data[offsets[i]..offsets[i + 1]]`. Storing a list this way
+/// costs two allocations regardless of its length, and Python strings are
+/// only created for the paths a caller actually touches.
+pub struct PathList {
+    data: String,
+    offsets: Vec<u32>,
+}
+
+impl PathList {
+    /// Create an empty list
+    pub fn new() -> Self {
+        Self::with_capacity(0, 0)
+    }
+
+    /// Create an empty list sized for `paths` entries totalling `bytes` bytes
+    pub fn with_capacity(paths: usize, bytes: usize) -> Self {
+        let mut offsets = Vec::with_capacity(paths + 1);
+        offsets.push(0);
+        Self {
+            data: String::with_capacity(bytes),
+            offsets,
+        }
+    }
+
+    /// Append a path
+    pub fn push(&mut self, path: &str) {
+        self.data.push_str(path);
+        self.offsets.push(self.data.len() as u32);
+    }
+
+    /// Number of paths
+    pub fn len(&self) -> usize {
+        self.offsets.len() - 1
+    }
+
+    /// Whether the list holds no paths
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+
+    /// Path at `index`
+    pub fn get(&self, index: usize) -> Option<&str> {
+        let start = *self.offsets.get(index)? as usize;
+        let end = *self.offsets.get(index + 1)? as usize;
+        Some(&self.data[start..end])
+    }
+
+    /// Iterate over all paths in order
+    pub fn iter(&self) -> impl ExactSizeIterator<Item = &str> + '_ {
+        self.offsets
+            .windows(2)
+            .map(move |w| &self.data[w[0] as usize..w[1] as usize])
+    }
+
+    /// Concatenated UTF-8 path data
+    pub fn as_bytes(&self) -> &[u8] {
+        self.data.as_bytes()
+    }
+
+    /// Offset table (`len() + 1` entries, starting at 0)
+    pub fn offsets(&self) -> &[u32] {
+        &self.offsets
+    }
+}
+
+impl Default for PathList {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+impl<'a> FromIterator<&'a str> for PathList {
+    fn from_iter<I: IntoIterator<Item = &'a str>>(iter: I) -> Self {
+        let iter = iter.into_iter();
+        let mut list = Self::with_capacity(iter.size_hint().0, 0);
+        for path in iter {
+            list.push(path);
+        }
+        list
+    }
+}
+
+/// Index accepted by `ChangedFilesView.__getitem__`
+#[derive(FromPyObject)]
+enum SequenceIndex<'py> {
+    Int(isize),
+    Slice(Bound<'py, PySlice>),
+}
+
+/// Read-only sequence of paths backed by a `PathList`
+///
+/// Behaves like a list of `str` (indexing, slicing, iteration, `len`, `in`),
+/// but only creates Python strings on access. `buffer` and `offsets` give
+/// bulk access to the packed data without per-path objects.
+#[pyclass(name = "ChangedFilesView", frozen, sequence)]
+pub struct PyChangedFilesView {
+    paths: Arc<PathList>,
+}
+
+impl PyChangedFilesView {
+    /// Create a view sharing `paths`
+    pub fn new(paths: &Arc<PathList>) -> Self {
+        Self {
+            paths: Arc::clone(paths),
+        }
+    }
+}
+
+#[pymethods]
+impl PyChangedFilesView {
+    fn __len__(&self) -> usize {
+        self.paths.len()
+    }
+
+    fn __getitem__<'py>(&self, py: Python<'py>, index: SequenceIndex<'py>) -> PyResult<Py<PyAny>> {
+        match index {
+            SequenceIndex::Int(i) => {
+                let len = self.paths.len() as isize;
+                let i = if i < 0 { i + len } else { i };
+                if i < 0 || i >= len {
+                    return Err(PyIndexError::new_err("ChangedFilesView index out of range"));
+                }
+                let path = self.paths.get(i as usize).unwrap_or_default();
+                Ok(PyString::new(py, path).into_any().unbind())
+            }
+            SequenceIndex::Slice(slice) => {
+                let indices = slice.indices(self.paths.len() as isize)?;
+                let items = (0..indices.slicelength as isize).map(|k| {
+                    let i = indices.start + k * indices.step;
+                    self.paths.get(i as usize).unwrap_or_default()
+                });
+                Ok(PyList::new(py, items)?.into_any().unbind())
+            }
+        }
+    }
+
+    fn __iter__(&self) -> PyChangedFilesIterator {
+        PyChangedFilesIterator {
+            paths: Arc::clone(&self.paths),
+            index: 0,
+        }
+    }
+
+    fn __contains__(&self, path: &Bound<'_, PyAny>) -> bool {
+        match path.extract::<PyBackedStr>() {
+            Ok(path) => self.paths.iter().any(|p| p == &*path),
+            Err(_) => false,
+        }
+    }
+
+    /// Equal to another view or a `list` of the same paths
+    ///
+    /// Other operands (tuples included, as for the `list` this view
+    /// stands in for) get `NotImplemented`, so Python can try the
+    /// reflected comparison.
+    fn __eq__(&self, py: Python<'_>, other: &Bound<'_, PyAny>) -> Py<PyAny> {
+        let equal = if let Ok(other) = other.extract::<PyRef<'_, PyChangedFilesView>>() {
+            self.paths.offsets() == other.paths.offsets()
+                && self.paths.as_bytes() == other.paths.as_bytes()
+        } else if other.is_instance_of::<PyList>() {
+            match other.extract::<Vec<PyBackedStr>>() {
+                Ok(other) => {
+                    other.len() == self.paths.len()
+                        && self.paths.iter().zip(&other).all(|(a, b)| a == &**b)
+                }
+                Err(_) => false,
+            }
+        } else {
+            return py.NotImplemented();
+        };
+        PyBool::new(py, equal).to_owned().into_any().unbind()
+    }
+
+    fn __repr__(&self, py: Python<'_>) -> PyResult<String> {
+        let list = PyList::new(py, self.paths.iter())?;
+        Ok(list.repr()?.to_string())
+    }
+
+    /// Concatenated UTF-8 path data
+    #[getter]
+    fn buffer<'py>(&self, py: Python<'py>) -> Bound<'py, PyBytes> {
+        PyBytes::new(py, self.paths.as_bytes())
+    }
+
+    /// Offsets into `buffer` as a memoryview of unsigned 32-bit ints
+    ///
+    /// Path `i` is `buffer[offsets[i]:offsets[i + 1]]`.
+    #[getter]
+    fn offsets<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
+        let offsets = self.paths.offsets();
+        let bytes = PyBytes::new_with(py, offsets.len() * 4, |buf| {
+            for (chunk, offset) in buf.chunks_exact_mut(4).zip(offsets) {
+                chunk.copy_from_slice(&offset.to_ne_bytes());
+            }
+            Ok(())
+        })?;
+        PyMemoryView::from(bytes.as_any())?.call_method1("cast", ("I",))
+    }
+}
+
+/// Iterator over a `ChangedFilesView`
+#[pyclass(name = "ChangedFilesIterator")]
+pub struct PyChangedFilesIterator {
+    paths: Arc<PathList>,
+    index: usize,
+}
+
+#[pymethods]
+impl PyChangedFilesIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__<'py>(&mut self, py: Python<'py>) -> Option<Bound<'py, PyString>> {
+        let path = self.paths.get(self.index)?;
+        self.index += 1;
+        Some(PyString::new(py, path))
+    }
+
+    /// Paths left to yield, so `list(iter(view))` allocates its result once
+    fn __length_hint__(&self) -> usize {
+        self.paths.len().saturating_sub(self.index)
+    }
+}
@@ -2,6 +2,7 @@
 
 use lechange_core::platform::PathUtil;
 use pyo3::prelude::*;
+use pyo3::types::PyList;
 
 /// Python path utility wrapper (all static methods)
 #[pyclass(name = "PathUtil")]
@@ -34,8 +35,9 @@ impl PyPathUtil {
 
     /// Split path into components
     #[staticmethod]
-    fn components(path: &str) -> Vec<String> {
-        PathUtil::components(path).map(|s| s.to_string()).collect()
+    fn components<'py>(py: Python<'py>, path: &str) -> PyResult<Bound<'py, PyList>> {
+        let parts: Vec<&str> = PathUtil::components(path).collect();
+        PyList::new(py, parts)
     }
 
     /// Get platform-specific separator
@@ -1,18 +1,44 @@
 //! Python bindings for PatternMatcher
 
+use lechange_core::patterns::loader::PatternLoader;
 use lechange_core::patterns::matcher::PatternMatcher;
 use pyo3::prelude::*;
+use pyo3::pybacked::PyBackedStr;
+use std::sync::Arc;
 
 /// Python pattern matcher wrapper
+///
+/// Matchers built from the same patterns share one compiled core matcher
+/// through the core's process-wide cache.
 #[pyclass(name = "PatternMatcher")]
 pub struct PyPatternMatcher {
-    inner: PatternMatcher,
+    inner: Arc<PatternMatcher>,
 }
 
+/// Path count from which `filter`/`partition` match with the GIL released
+const DETACH_THRESHOLD: usize = 256;
+
 impl PyPatternMatcher {
     /// Create from an existing core PatternMatcher (used by pattern_loader)
     pub(crate) fn from_inner(inner: PatternMatcher) -> Self {
-        Self { inner }
+        Self {
+            inner: Arc::new(inner),
+        }
+    }
+
+    /// Match every path, releasing the GIL for large batches
+    ///
+    /// Paths are extracted once as `PyBackedStr`, which owns or references
+    /// their UTF-8 data independently of the GIL. Under the abi3-py38
+    /// limited API that means one UTF-8 `bytes` copy per input, and results
+    /// are handed back as new `str` objects rather than the originals.
+    fn match_flags(&self, py: Python<'_>, paths: &[PyBackedStr]) -> Vec<bool> {
+        let run = || -> Vec<bool> { paths.iter().map(|p| self.inner.matches_sync(p)).collect() };
+        if paths.len() >= DETACH_THRESHOLD {
+            py.detach(run)
+        } else {
+            run()
+        }
     }
 }
 
@@ -31,35 +57,50 @@ impl PyPatternMatcher {
         let inc_refs: Vec<&str> = inc.iter().map(|s| s.as_str()).collect();
         let exc_refs: Vec<&str> = exc.iter().map(|s| s.as_str()).collect();
 
-        let inner = PatternMatcher::new(&inc_refs, &exc_refs, negation_first).map_err(|e| {
+        let inner = PatternMatcher::cached(&inc_refs, &exc_refs, negation_first).map_err(|e| {
             PyErr::new::<crate::error::ConfigError, _>(format!("Invalid pattern: {}", e))
         })?;
 
         Ok(Self { inner })
     }
 
+    /// Drop all cached compiled matchers, globs and YAML groups (existing matchers keep working)
+    #[staticmethod]
+    fn clear_cache() {
+        PatternMatcher::clear_cache();
+        PatternLoader::clear_cache();
+    }
+
     /// Check if a path matches the patterns
     fn matches(&self, path: &str) -> bool {
         self.inner.matches_sync(path)
     }
 
     /// Filter a list of paths, returning only those that match
-    fn filter(&self, paths: Vec<String>) -> Vec<String> {
+    fn filter(&self, py: Python<'_>, paths: Vec<PyBackedStr>) -> Vec<PyBackedStr> {
+        let flags = self.match_flags(py, &paths);
         paths
             .into_iter()
-            .filter(|p| self.inner.matches_sync(p))
+            .zip(flags)
+            .filter_map(|(path, matched)| matched.then_some(path))
             .collect()
     }
 
     /// Partition paths into (matched, unmatched)
-    fn partition(&self, paths: Vec<String>) -> (Vec<String>, Vec<String>) {
-        let mut matched = Vec::new();
-        let mut unmatched = Vec::new();
-        for p in paths {
-            if self.inner.matches_sync(&p) {
-                matched.push(p);
+    fn partition(
+        &self,
+        py: Python<'_>,
+        paths: Vec<PyBackedStr>,
+    ) -> (Vec<PyBackedStr>, Vec<PyBackedStr>) {
+        let flags = self.match_flags(py, &paths);
+        let matched_count = flags.iter().filter(|&&m| m).count();
+        let mut matched = Vec::with_capacity(matched_count);
+        let mut unmatched = Vec::with_capacity(paths.len() - matched_count);
+        for (path, is_match) in paths.into_iter().zip(flags) {
+            if is_match {
+                matched.push(path);
             } else {
-                unmatched.push(p);
+                unmatched.push(path);
             }
         }
         (matched, unmatched)
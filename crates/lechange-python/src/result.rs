@@ -1,39 +1,39 @@
 //! Result type conversions — accepts ProcessedResult + ComputedOutputs
 
+use crate::path_list::{PathList, PyChangedFilesView};
 use lechange_core::interner::StringInterner;
 use lechange_core::output::computed::ComputedOutputs;
-use lechange_core::output::json_format::format_deploy_matrix;
+use lechange_core::output::json_format::{format_deploy_matrix, write_json_array};
 use lechange_core::types::{GroupDeployAction, ProcessedResult, RebuildReasonKind};
 use pyo3::prelude::*;
-use pyo3::types::{PyDict, PyList};
+use pyo3::types::{PyBytes, PyDict, PyList};
+use std::sync::Arc;
 
 /// Python result wrapper
 #[pyclass(name = "ChangedFiles")]
 pub struct PyChangedFiles {
-    // Per-type filtered lists (resolved strings)
-    added_files: Vec<String>,
-    copied_files: Vec<String>,
-    deleted_files: Vec<String>,
-    modified_files: Vec<String>,
-    renamed_files: Vec<String>,
-    type_changed_files: Vec<String>,
-    unmerged_files: Vec<String>,
-    unknown_files: Vec<String>,
+    // Per-type filtered lists (packed paths, exposed as lazy views)
+    added_files: Arc<PathList>,
+    copied_files: Arc<PathList>,
+    deleted_files: Arc<PathList>,
+    modified_files: Arc<PathList>,
+    renamed_files: Arc<PathList>,
+    type_changed_files: Arc<PathList>,
+    unmerged_files: Arc<PathList>,
+    unknown_files: Arc<PathList>,
 
     // All files (filtered + unfiltered)
-    all_changed_files: Vec<String>,
-    all_changed_and_modified_files: Vec<String>,
+    all_changed_files: Arc<PathList>,
+    all_changed_and_modified_files: Arc<PathList>,
 
     // "Other" (unmatched) categories
-    other_changed_files: Vec<String>,
-    other_modified_files: Vec<String>,
-    other_deleted_files: Vec<String>,
+    other_changed_files: Arc<PathList>,
+    other_modified_files: Arc<PathList>,
+    other_deleted_files: Arc<PathList>,
 
-    // Rename mapping: old_path -> new_path
-    renamed_mapping: Vec<(String, String)>,
-
-    // Old+new renamed files
-    all_old_new_renamed_files: Vec<String>,
+    // Renames as interleaved pairs [old1, new1, old2, new2, ...]; backs
+    // both all_old_new_renamed_files and renamed_files_mapping
+    renamed_pairs: Arc<PathList>,
 
     // YAML group keys
     modified_keys: Vec<String>,
@@ -92,73 +92,96 @@ impl PyChangedFiles {
     // === File lists ===
 
     #[getter]
-    fn added_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.added_files).unwrap()
+    fn added_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.added_files)
     }
 
     #[getter]
-    fn copied_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.copied_files).unwrap()
+    fn copied_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.copied_files)
     }
 
     #[getter]
-    fn deleted_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.deleted_files).unwrap()
+    fn deleted_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.deleted_files)
     }
 
     #[getter]
-    fn modified_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.modified_files).unwrap()
+    fn modified_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.modified_files)
     }
 
     #[getter]
-    fn renamed_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.renamed_files).unwrap()
+    fn renamed_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.renamed_files)
     }
 
     #[getter]
-    fn type_changed_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.type_changed_files).unwrap()
+    fn type_changed_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.type_changed_files)
     }
 
     #[getter]
-    fn unmerged_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.unmerged_files).unwrap()
+    fn unmerged_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.unmerged_files)
     }
 
     #[getter]
-    fn unknown_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.unknown_files).unwrap()
+    fn unknown_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.unknown_files)
     }
 
     #[getter]
-    fn all_changed_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.all_changed_files).unwrap()
+    fn all_changed_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.all_changed_files)
+    }
+
+    /// `all_changed_files` as a JSON array string
+    ///
+    /// Built directly from the packed paths in one pre-sized buffer, without
+    /// creating a Python string per path.
+    fn all_changed_files_json(&self) -> String {
+        let paths = &self.all_changed_files;
+        let mut buf = String::with_capacity(paths.as_bytes().len() + paths.len() * 3 + 2);
+        write_json_array(paths.iter(), &mut buf);
+        buf
+    }
+
+    /// `all_changed_files` as a list of UTF-8 encoded `bytes`
+    ///
+    /// Copies each path straight out of the packed buffer, skipping the
+    /// `str` decode, for callers that only scan path bytes.
+    fn all_changed_files_bytes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        let paths = &self.all_changed_files;
+        PyList::new(
+            py,
+            paths.iter().map(|path| PyBytes::new(py, path.as_bytes())),
+        )
     }
 
     #[getter]
-    fn all_changed_and_modified_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.all_changed_and_modified_files).unwrap()
+    fn all_changed_and_modified_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.all_changed_and_modified_files)
     }
 
     #[getter]
-    fn other_changed_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.other_changed_files).unwrap()
+    fn other_changed_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.other_changed_files)
     }
 
     #[getter]
-    fn other_modified_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.other_modified_files).unwrap()
+    fn other_modified_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.other_modified_files)
     }
 
     #[getter]
-    fn other_deleted_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.other_deleted_files).unwrap()
+    fn other_deleted_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.other_deleted_files)
     }
 
     #[getter]
-    fn all_old_new_renamed_files<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
-        PyList::new(py, &self.all_old_new_renamed_files).unwrap()
+    fn all_old_new_renamed_files(&self) -> PyChangedFilesView {
+        PyChangedFilesView::new(&self.renamed_pairs)
     }
 
     // === YAML group keys ===
@@ -258,7 +281,8 @@ impl PyChangedFiles {
     #[getter]
     fn renamed_files_mapping<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
         let dict = PyDict::new(py);
-        for (old, new) in &self.renamed_mapping {
+        let mut paths = self.renamed_pairs.iter();
+        while let (Some(old), Some(new)) = (paths.next(), paths.next()) {
             dict.set_item(old, new)?;
         }
         Ok(dict)
@@ -456,69 +480,64 @@ impl PyChangedFiles {
             }
         };
 
-        // Helper to resolve index list to strings
-        let resolve_indices = |indices: &[u32]| -> Vec<String> {
-            indices
-                .iter()
-                .filter_map(|&i| {
-                    let file = &result.all_files[i as usize];
-                    interner.resolve(file.path).map(&resolve_path)
-                })
-                .collect()
+        // Helper to pack resolved paths into one buffer (no per-path String)
+        let push_path = |list: &mut PathList, s: &str| {
+            if use_posix_path_separator {
+                list.push(&lechange_core::platform::PathUtil::to_posix(s));
+            } else {
+                list.push(s);
+            }
+        };
+        let pack_indices = |indices: &[u32]| -> PathList {
+            let mut list = PathList::with_capacity(indices.len(), 0);
+            for &i in indices {
+                let file = &result.all_files[i as usize];
+                if let Some(path) = interner.resolve(file.path) {
+                    push_path(&mut list, path);
+                }
+            }
+            list
         };
 
         // Per-type filtered lists
-        let added_files = resolve_indices(&outputs.filtered_added);
-        let copied_files = resolve_indices(&outputs.filtered_copied);
-        let mut deleted_files = resolve_indices(&outputs.filtered_deleted);
-        let modified_files = resolve_indices(&outputs.filtered_modified);
-        let renamed_files = resolve_indices(&outputs.filtered_renamed);
-        let type_changed_files = resolve_indices(&outputs.filtered_type_changed);
-        let unmerged_files = resolve_indices(&outputs.filtered_unmerged);
-        let unknown_files = resolve_indices(&outputs.filtered_unknown);
+        let added_files = pack_indices(&outputs.filtered_added);
+        let copied_files = pack_indices(&outputs.filtered_copied);
+        let mut deleted_files = pack_indices(&outputs.filtered_deleted);
+        let modified_files = pack_indices(&outputs.filtered_modified);
+        let renamed_files = pack_indices(&outputs.filtered_renamed);
+        let type_changed_files = pack_indices(&outputs.filtered_type_changed);
+        let unmerged_files = pack_indices(&outputs.filtered_unmerged);
+        let unknown_files = pack_indices(&outputs.filtered_unknown);
 
         // Include rename-split deletions (old paths of renames treated as deleted)
         for &(_idx, prev_path) in &outputs.rename_split_deletions {
             if let Some(path_str) = interner.resolve(prev_path) {
-                deleted_files.push(resolve_path(path_str));
+                push_path(&mut deleted_files, path_str);
             }
         }
 
         // All filtered files
-        let all_changed_files = resolve_indices(&result.filtered_indices);
+        let all_changed_files = pack_indices(&result.filtered_indices);
 
         // All changed and modified
-        let all_changed_and_modified_files = resolve_indices(&outputs.all_changed_and_modified);
+        let all_changed_and_modified_files = pack_indices(&outputs.all_changed_and_modified);
 
         // "Other" categories
-        let other_changed_files = resolve_indices(&outputs.other_changed);
-        let other_modified_files = resolve_indices(&outputs.other_modified);
-        let other_deleted_files = resolve_indices(&outputs.other_deleted);
-
-        // Rename mapping
-        let renamed_mapping: Vec<(String, String)> = outputs
-            .renamed_mapping
-            .iter()
-            .filter_map(|&(idx, prev_path)| {
-                let file = &result.all_files[idx as usize];
-                let new_path = interner.resolve(file.path)?;
-                let old_path = interner.resolve(prev_path)?;
-                Some((resolve_path(old_path), resolve_path(new_path)))
-            })
-            .collect();
-
-        // Old+new renamed files: [old1, new1, old2, new2, ...]
-        let all_old_new_renamed_files: Vec<String> = outputs
-            .renamed_mapping
-            .iter()
-            .filter_map(|&(idx, prev_path)| {
-                let file = &result.all_files[idx as usize];
-                let new_path = interner.resolve(file.path)?;
-                let old_path = interner.resolve(prev_path)?;
-                Some(vec![resolve_path(old_path), resolve_path(new_path)])
-            })
-            .flatten()
-            .collect();
+        let other_changed_files = pack_indices(&outputs.other_changed);
+        let other_modified_files = pack_indices(&outputs.other_modified);
+        let other_deleted_files = pack_indices(&outputs.other_deleted);
+
+        // Renames, packed once as [old1, new1, old2, new2, ...]
+        let mut renamed_pairs = PathList::with_capacity(outputs.renamed_mapping.len() * 2, 0);
+        for &(idx, prev_path) in &outputs.renamed_mapping {
+            let file = &result.all_files[idx as usize];
+            if let (Some(old_path), Some(new_path)) =
+                (interner.resolve(prev_path), interner.resolve(file.path))
+            {
+                push_path(&mut renamed_pairs, old_path);
+                push_path(&mut renamed_pairs, new_path);
+            }
+        }
 
         // CI decision
         let (files_to_rebuild, files_to_skip, failed_jobs, successful_jobs, rebuild_reasons) =
@@ -654,21 +673,20 @@ impl PyChangedFiles {
             .collect();
 
         Self {
-            added_files,
-            copied_files,
-            deleted_files,
-            modified_files,
-            renamed_files,
-            type_changed_files,
-            unmerged_files,
-            unknown_files,
-            all_changed_files,
-            all_changed_and_modified_files,
-            other_changed_files,
-            other_modified_files,
-            other_deleted_files,
-            renamed_mapping,
-            all_old_new_renamed_files,
+            added_files: Arc::new(added_files),
+            copied_files: Arc::new(copied_files),
+            deleted_files: Arc::new(deleted_files),
+            modified_files: Arc::new(modified_files),
+            renamed_files: Arc::new(renamed_files),
+            type_changed_files: Arc::new(type_changed_files),
+            unmerged_files: Arc::new(unmerged_files),
+            unknown_files: Arc::new(unknown_files),
+            all_changed_files: Arc::new(all_changed_files),
+            all_changed_and_modified_files: Arc::new(all_changed_and_modified_files),
+            other_changed_files: Arc::new(other_changed_files),
+            other_modified_files: Arc::new(other_modified_files),
+            other_deleted_files: Arc::new(other_deleted_files),
+            renamed_pairs: Arc::new(renamed_pairs),
             modified_keys: outputs
                 .modified_keys
                 .iter()
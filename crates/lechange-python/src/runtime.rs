@@ -1,31 +1,54 @@
 //! Tokio runtime management for Python bindings
 
-use once_cell::sync::OnceCell;
+use crate::error::core_error_to_py;
+use once_cell::sync::{Lazy, OnceCell};
 use pyo3::prelude::*;
-use std::sync::Arc;
 use tokio::runtime::{Builder, Runtime};
+use tokio::sync::Semaphore;
+
+/// Upper bound on runtime workers; detection is dominated by object database reads
+const MAX_WORKER_THREADS: usize = 8;
 
 // Global runtime - initialized once, lives for process lifetime
-static RUNTIME: OnceCell<Arc<Runtime>> = OnceCell::new();
+static RUNTIME: OnceCell<&'static Runtime> = OnceCell::new();
+
+// Bounds how many async detections run at once
+static DETECTION_PERMITS: Lazy<Semaphore> = Lazy::new(|| Semaphore::new(worker_threads()));
+
+/// Number of runtime workers: one per CPU, capped at `MAX_WORKER_THREADS`
+fn worker_threads() -> usize {
+    std::thread::available_parallelism()
+        .map(|n| n.get())
+        .unwrap_or(4)
+        .min(MAX_WORKER_THREADS)
+}
 
 /// Get or initialize the global Tokio runtime
-pub fn get_runtime() -> PyResult<Arc<Runtime>> {
+///
+/// The runtime is also registered with `pyo3-async-runtimes`, so awaitables
+/// handed to Python run on the same worker pool as blocking calls.
+pub fn get_runtime() -> PyResult<&'static Runtime> {
     RUNTIME
         .get_or_try_init(|| {
-            Builder::new_multi_thread()
-                .worker_threads(4)
+            let runtime = Builder::new_multi_thread()
+                .worker_threads(worker_threads())
                 .thread_name("lechange-worker")
                 .enable_all()
                 .build()
-                .map(Arc::new)
                 .map_err(|e| {
                     PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!(
                         "Failed to initialize Tokio runtime: {}",
                         e
                     ))
-                })
+                })?;
+
+            // Leaked on purpose: the runtime lives for the process lifetime and
+            // pyo3-async-runtimes requires a 'static reference
+            let runtime: &'static Runtime = Box::leak(Box::new(runtime));
+            let _ = pyo3_async_runtimes::tokio::init_with_runtime(runtime);
+            Ok(runtime)
         })
-        .cloned()
+        .copied()
 }
 
 /// Execute an async function on the runtime, blocking until completion
@@ -37,14 +60,27 @@ where
     let runtime = get_runtime()?;
 
     // Release GIL during blocking operation to allow other Python threads
-    Python::attach(|py| {
-        py.detach(|| {
-            runtime.block_on(future).map_err(|e| {
-                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!(
-                    "Async operation failed: {}",
-                    e
-                ))
-            })
-        })
+    Python::attach(|py| py.detach(|| runtime.block_on(future).map_err(core_error_to_py)))
+}
+
+/// Spawn an async function on the runtime and return a Python awaitable
+///
+/// The future runs on a runtime worker without the GIL. At most one
+/// detection per worker runs at a time; further calls wait for a permit.
+pub fn future_into_py<'py, F, T>(py: Python<'py>, future: F) -> PyResult<Bound<'py, PyAny>>
+where
+    F: std::future::Future<Output = lechange_core::Result<T>> + Send + 'static,
+    T: for<'a> IntoPyObject<'a> + Send + 'static,
+{
+    get_runtime()?;
+
+    pyo3_async_runtimes::tokio::future_into_py(py, async move {
+        let _permit = DETECTION_PERMITS.acquire().await.map_err(|e| {
+            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!(
+                "Detection semaphore closed: {}",
+                e
+            ))
+        })?;
+        future.await.map_err(core_error_to_py)
     })
 }
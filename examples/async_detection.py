@@ -10,53 +10,49 @@ import asyncio
 from lechange import ChangeDetector, Config
 
 
+# Commit ranges to check: (base, head, description)
+RANGES = [
+    ("HEAD~1", "HEAD", "Last commit"),
+    ("HEAD~5", "HEAD", "Last 5 commits"),
+    ("HEAD~10", "HEAD", "Last 10 commits"),
+]
+
+# Upper bound on per-range detections in flight at once
+MAX_CONCURRENT_DETECTIONS = 4
+
+
 async def detect_multiple_ranges():
-    """Detect changes across multiple commit ranges concurrently."""
+    """Detect changes across multiple commit ranges in one batch call."""
     detector = ChangeDetector(".")
 
-    # Define multiple ranges to check
-    ranges = [
-        ("HEAD~1", "HEAD", "Last commit"),
-        ("HEAD~5", "HEAD", "Last 5 commits"),
-        ("HEAD~10", "HEAD", "Last 10 commits"),
-    ]
+    # Detect every range in a single awaitable call; it runs on the
+    # library's own runtime, so no event-loop thread-pool worker is tied up
+    configs = [Config(base=base, head=head) for base, head, _ in RANGES]
+    batch = await detector.get_changed_files_batch_async(configs)
 
-    # Create tasks for concurrent detection
-    tasks = []
-    for base, head, description in ranges:
-        config = Config(base=base, head=head)
-        task = asyncio.create_task(
-            detector.get_changed_files_async(config)
-        )
-        tasks.append((task, description))
+    return [(description, result) for (_, _, description), result in zip(RANGES, batch)]
 
-    # Wait for all detections to complete
-    results = []
-    for task, description in tasks:
-        result = await task
-        results.append((description, result))
 
-    return results
+async def detect_ranges_individually():
+    """Detect each range with its own awaitable, bounded by a semaphore.
 
+    Use this shape when ranges arrive independently or need per-range
+    handling. The semaphore caps how many detections are in flight, so a
+    long list of ranges does not oversubscribe the detector's workers.
+    """
+    detector = ChangeDetector(".")
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DETECTIONS)
 
-async def main():
-    print("=== Async Change Detection ===\n")
+    async def detect(base, head, description):
+        async with semaphore:
+            result = await detector.get_changed_files_async(Config(base=base, head=head))
+        return description, result
 
-    # Run concurrent detections
-    results = await detect_multiple_ranges()
+    return await asyncio.gather(*(detect(*r) for r in RANGES))
 
-    # Print results
-    for description, result in results:
-        print(f"{description}:")
-        print(f"  Total changes: {result.all_changed_files_count}")
-        print(f"  Added: {result.added_files_count}")
-        print(f"  Modified: {result.modified_files_count}")
-        print(f"  Deleted: {result.deleted_files_count}")
-        print()
-
-    print("=== Pattern-based Async Detection ===\n")
 
-    # Async detection with patterns
+async def detect_source_changes():
+    """Detect Python/Rust changes over the last 5 commits."""
     detector = ChangeDetector(".")
     config = Config(
         base="HEAD~5",
@@ -64,7 +60,36 @@ async def main():
         files=["**/*.py", "**/*.rs"]
     )
 
-    result = await detector.get_changed_files_async(config)
+    return await detector.get_changed_files_async(config)
+
+
+async def main():
+    print("=== Async Change Detection ===\n")
+
+    # The detections are independent: run them concurrently. If any fails,
+    # gather propagates the first exception immediately.
+    results, individual, result = await asyncio.gather(
+        detect_multiple_ranges(),
+        detect_ranges_individually(),
+        detect_source_changes(),
+    )
+
+    # Print results
+    for description, range_result in results:
+        print(f"{description}:")
+        print(f"  Total changes: {range_result.all_changed_files_count}")
+        print(f"  Added: {range_result.added_files_count}")
+        print(f"  Modified: {range_result.modified_files_count}")
+        print(f"  Deleted: {range_result.deleted_files_count}")
+        print()
+
+    print("=== Per-range Async Detection (bounded) ===\n")
+
+    for description, range_result in individual:
+        print(f"{description}: {range_result.all_changed_files_count} changes")
+    print()
+
+    print("=== Pattern-based Async Detection ===\n")
 
     print(f"Changed Python/Rust files: {result.all_changed_files_count}")
     for file in result.all_changed_files[:10]:  # Show first 10
@@ -32,6 +32,18 @@ def determine_base_sha(context):
         return "HEAD^"
 
 
+def write_github_output(lines):
+    """Append output lines to $GITHUB_OUTPUT with a single write."""
+    path = os.getenv("GITHUB_OUTPUT")
+    if not path or not lines:
+        return
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, "".join(lines).encode())
+    finally:
+        os.close(fd)
+
+
 def main():
     print("=== GitHub Actions Change Detection ===\n")
 
@@ -41,11 +53,17 @@ def main():
     print()
 
     detector = ChangeDetector(".")
-    base_sha = determine_base_sha(context)
+
+    # Resolve both ends of the range once; every Config below reuses the SHAs
+    base_sha = detector.resolve(determine_base_sha(context))
+    head_sha = detector.resolve("HEAD")
+
+    # GitHub Actions output lines, written in one append at the end
+    outputs = []
 
     # Example 1: Detect all changes
     print("--- All Changes ---")
-    config = Config(base=base_sha, head="HEAD")
+    config = Config(base=base_sha, head=head_sha)
     result = detector.get_changed_files(config)
 
     print(f"Total changes: {result.all_changed_files_count}")
@@ -55,7 +73,7 @@ def main():
     print("--- Python Files Changed ---")
     config = Config(
         base=base_sha,
-        head="HEAD",
+        head=head_sha,
         files=["**/*.py"]
     )
     result = detector.get_changed_files(config)
@@ -64,18 +82,15 @@ def main():
     print(f"Run Python tests: {run_python_tests}")
     print(f"Changed files: {result.all_changed_files_count}")
 
-    # Set GitHub Actions output
-    if os.getenv("GITHUB_OUTPUT"):
-        with open(os.getenv("GITHUB_OUTPUT"), "a") as f:
-            f.write(f"run_python_tests={str(run_python_tests).lower()}\n")
-            f.write(f"python_files_count={result.all_changed_files_count}\n")
+    outputs.append(f"run_python_tests={str(run_python_tests).lower()}\n")
+    outputs.append(f"python_files_count={result.all_changed_files_count}\n")
     print()
 
     # Example 3: Check if Rust files changed (for Rust tests)
     print("--- Rust Files Changed ---")
     config = Config(
         base=base_sha,
-        head="HEAD",
+        head=head_sha,
         files=["**/*.rs", "**/Cargo.toml"]
     )
     result = detector.get_changed_files(config)
@@ -84,42 +99,37 @@ def main():
     print(f"Run Rust tests: {run_rust_tests}")
     print(f"Changed files: {result.all_changed_files_count}")
 
-    # Set GitHub Actions output
-    if os.getenv("GITHUB_OUTPUT"):
-        with open(os.getenv("GITHUB_OUTPUT"), "a") as f:
-            f.write(f"run_rust_tests={str(run_rust_tests).lower()}\n")
-            f.write(f"rust_files_count={result.all_changed_files_count}\n")
+    outputs.append(f"run_rust_tests={str(run_rust_tests).lower()}\n")
+    outputs.append(f"rust_files_count={result.all_changed_files_count}\n")
     print()
 
     # Example 4: Check if documentation changed
     print("--- Documentation Changed ---")
     config = Config(
         base=base_sha,
-        head="HEAD",
+        head=head_sha,
         files=["**/*.md", "docs/**"]
     )
-    result = detector.get_changed_files(config)
-
-    docs_changed = result.any_changed
+    # Only the yes/no answer is needed: stop at the first matching file
+    docs_changed = detector.any_changed(config)
     print(f"Documentation changed: {docs_changed}")
 
-    # Set GitHub Actions output
-    if os.getenv("GITHUB_OUTPUT"):
-        with open(os.getenv("GITHUB_OUTPUT"), "a") as f:
-            f.write(f"docs_changed={str(docs_changed).lower()}\n")
+    outputs.append(f"docs_changed={str(docs_changed).lower()}\n")
     print()
 
     # Example 5: Output changed files as JSON for further processing
     print("--- JSON Output ---")
     config = Config(
         base=base_sha,
-        head="HEAD",
+        head=head_sha,
         json=True
     )
     result = detector.get_changed_files(config)
 
     # In GitHub Actions, you can use this JSON output in subsequent steps
-    print(f"All changed files (JSON): {result.all_changed_files}")
+    print(f"All changed files (JSON): {result.all_changed_files_json()}")
+
+    write_github_output(outputs)
 
 
 if __name__ == "__main__":
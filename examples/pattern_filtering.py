@@ -12,58 +12,30 @@ from lechange import ChangeDetector, Config
 def main():
     detector = ChangeDetector(".")
 
-    # Example 1: Only Python files
-    print("=== Example 1: Only Python files ===")
-    config = Config(
-        base="HEAD~5",
-        head="HEAD",
-        files=["**/*.py"]
+    # Every example shares the HEAD~5..HEAD range: diff it once and apply
+    # each pattern set to that single diff. An entry is either a list of
+    # include patterns or an (include, ignore) pair.
+    examples = [
+        ("Example 1: Only Python files", "Changed Python files", ["**/*.py"]),
+        ("Example 2: Rust and TOML files", "Changed Rust/TOML files", ["**/*.rs", "**/*.toml"]),
+        ("Example 3: Files in src/ directory", "Changed files in src/", ["src/**"]),
+        (
+            "Example 4: All files except tests",
+            "Changed files (excluding tests)",
+            (["**/*"], ["**/tests/**", "**/test_*.py"]),
+        ),
+    ]
+    results = detector.get_changed_files_multi(
+        Config(base="HEAD~5", head="HEAD"),
+        [patterns for _, _, patterns in examples],
     )
-    result = detector.get_changed_files(config)
-    print(f"Changed Python files: {result.all_changed_files_count}")
-    for file in result.all_changed_files:
-        print(f"  {file}")
-    print()
 
-    # Example 2: Multiple file types
-    print("=== Example 2: Rust and TOML files ===")
-    config = Config(
-        base="HEAD~5",
-        head="HEAD",
-        files=["**/*.rs", "**/*.toml"]
-    )
-    result = detector.get_changed_files(config)
-    print(f"Changed Rust/TOML files: {result.all_changed_files_count}")
-    for file in result.all_changed_files:
-        print(f"  {file}")
-    print()
-
-    # Example 3: Specific directory
-    print("=== Example 3: Files in src/ directory ===")
-    config = Config(
-        base="HEAD~5",
-        head="HEAD",
-        files=["src/**"]
-    )
-    result = detector.get_changed_files(config)
-    print(f"Changed files in src/: {result.all_changed_files_count}")
-    for file in result.all_changed_files:
-        print(f"  {file}")
-    print()
-
-    # Example 4: Exclude patterns
-    print("=== Example 4: All files except tests ===")
-    config = Config(
-        base="HEAD~5",
-        head="HEAD",
-        files=["**/*"],
-        files_ignore=["**/tests/**", "**/test_*.py"]
-    )
-    result = detector.get_changed_files(config)
-    print(f"Changed files (excluding tests): {result.all_changed_files_count}")
-    for file in result.all_changed_files:
-        print(f"  {file}")
-    print()
+    for (title, label, _), result in zip(examples, results):
+        print(f"=== {title} ===")
+        print(f"{label}: {result.all_changed_files_count}")
+        for file in result.all_changed_files:
+            print(f"  {file}")
+        print()
 
 
 if __name__ == "__main__":
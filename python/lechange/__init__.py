@@ -6,28 +6,32 @@ Author: terekete <spicyzhug@gmail.com>
 License: AGPL-3.0-or-later (commercial license available)
 """
 
-from lechange._lechange import (
-    ChangeDetector,
-    Config,
-    ChangedFiles,
-    PatternMatcher,
-    PathUtil,
-    FileRecovery,
-    OutputWriter,
-    escape_json,
-    safe_output_escape,
-    format_json_array,
-    format_matrix,
-    load_yaml_patterns,
-    LeChangeError,
-    GitError,
-    ConfigError,
-    PathError,
-    RuntimeError as LeChangeRuntimeError,
-    RecoveryError,
-    YamlError,
-    ShallowCloneError,
-)
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from lechange._lechange import (
+        ChangeDetector,
+        Config,
+        ChangedFiles,
+        ChangedFilesView,
+        PatternMatcher,
+        PathUtil,
+        FileRecovery,
+        OutputWriter,
+        escape_json,
+        safe_output_escape,
+        format_json_array,
+        format_matrix,
+        load_yaml_patterns,
+        LeChangeError,
+        GitError,
+        ConfigError,
+        PathError,
+        RuntimeError as LeChangeRuntimeError,
+        RecoveryError,
+        YamlError,
+        ShallowCloneError,
+    )
 
 __version__ = "0.1.0"
 __author__ = "terekete"
@@ -38,6 +42,7 @@ __all__ = [
     "ChangeDetector",
     "Config",
     "ChangedFiles",
+    "ChangedFilesView",
     "PatternMatcher",
     "PathUtil",
     "FileRecovery",
@@ -57,3 +62,25 @@ __all__ = [
     "ShallowCloneError",
     "__version__",
 ]
+
+# Public name -> attribute of the native module. Symbols are resolved on
+# first access (PEP 562) and then cached in the module globals.
+_LAZY = {name: name for name in __all__ if name != "__version__"}
+_LAZY["LeChangeRuntimeError"] = "RuntimeError"
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        native_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    from lechange import _lechange
+
+    value = getattr(_lechange, native_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
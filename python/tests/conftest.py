@@ -2,137 +2,199 @@
 Shared fixtures for LeChange Python tests.
 """
 
+import ctypes
 import os
+import shutil
 import subprocess
+import sys
+
+import pygit2
 import pytest
 
+_SIGNATURE = pygit2.Signature("Test", "test@test.com")
 
-@pytest.fixture
-def tmp_git_repo(tmp_path):
+
+def _commit_index(repo, message):
+    """Write the index as a tree and commit it on HEAD."""
+    repo.index.write()
+    tree = repo.index.write_tree()
+    parents = [] if repo.head_is_unborn else [repo.head.target]
+    repo.create_commit("HEAD", _SIGNATURE, _SIGNATURE, message, tree, parents)
+
+
+def _clone_tree(src, dst):
+    """Copy a prepared repo, sharing data blocks where the filesystem allows."""
+    if sys.platform == "darwin":
+        clonefile = getattr(ctypes.CDLL(None, use_errno=True), "clonefile", None)
+        if clonefile is not None and clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return
+    elif sys.platform.startswith("linux"):
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=auto", str(src), str(dst)], capture_output=True
+        )
+        if result.returncode == 0:
+            return
+    shutil.rmtree(dst, ignore_errors=True)
+    shutil.copytree(src, dst, symlinks=True)
+
+
+def _init_repo(repo_path):
     """Create an empty git repo with an initial commit."""
-    repo = tmp_path / "repo"
-    repo.mkdir()
-    subprocess.run(["git", "init"], cwd=repo, check=True, capture_output=True)
-    subprocess.run(
-        ["git", "config", "user.name", "Test"], cwd=repo, check=True, capture_output=True
-    )
-    subprocess.run(
-        ["git", "config", "user.email", "test@test.com"], cwd=repo, check=True, capture_output=True
-    )
+    repo_path.mkdir()
+    repo = pygit2.init_repository(str(repo_path))
+    repo.config["user.name"] = "Test"
+    repo.config["user.email"] = "test@test.com"
     # Initial commit
-    (repo / "init.txt").write_text("init")
-    subprocess.run(["git", "add", "."], cwd=repo, check=True, capture_output=True)
-    subprocess.run(
-        ["git", "commit", "-m", "Initial commit"], cwd=repo, check=True, capture_output=True
-    )
-    return repo
+    (repo_path / "init.txt").write_text("init")
+    repo.index.add("init.txt")
+    _commit_index(repo, "Initial commit")
 
 
-@pytest.fixture
-def tmp_git_repo_with_changes(tmp_git_repo):
-    """Repo with added files in a second commit."""
-    repo = tmp_git_repo
-    src = repo / "src"
+def _add_source_files(repo_path):
+    """Add source and test files in a new commit."""
+    src = repo_path / "src"
     src.mkdir()
     (src / "main.py").write_text("print('hello')")
     (src / "util.py").write_text("def helper(): pass")
-    tests = repo / "tests"
+    tests = repo_path / "tests"
     tests.mkdir()
     (tests / "test_main.py").write_text("def test_main(): assert True")
-    subprocess.run(["git", "add", "."], cwd=repo, check=True, capture_output=True)
-    subprocess.run(
-        ["git", "commit", "-m", "Add source files"], cwd=repo, check=True, capture_output=True
-    )
-    return repo
+    repo = pygit2.Repository(str(repo_path))
+    repo.index.add_all()
+    _commit_index(repo, "Add source files")
+
+
+def _delete_util(repo_path):
+    """Delete src/util.py in a new commit."""
+    repo = pygit2.Repository(str(repo_path))
+    (repo_path / "src" / "util.py").unlink()
+    repo.index.remove("src/util.py")
+    _commit_index(repo, "Delete util.py")
+
+
+def _rename_util(repo_path):
+    """Rename src/util.py to src/helpers.py in a new commit."""
+    repo = pygit2.Repository(str(repo_path))
+    (repo_path / "src" / "util.py").rename(repo_path / "src" / "helpers.py")
+    repo.index.remove("src/util.py")
+    repo.index.add("src/helpers.py")
+    _commit_index(repo, "Rename util.py to helpers.py")
+
+
+# Base repos are built once per session; tests get their own copy below.
+
+
+@pytest.fixture(scope="session")
+def _base_git_repo(tmp_path_factory):
+    repo_path = tmp_path_factory.mktemp("repo_base", numbered=False) / "repo"
+    _init_repo(repo_path)
+    return repo_path
+
+
+@pytest.fixture(scope="session")
+def _base_git_repo_with_changes(tmp_path_factory, _base_git_repo):
+    repo_path = tmp_path_factory.mktemp("repo_changes", numbered=False) / "repo"
+    _clone_tree(_base_git_repo, repo_path)
+    _add_source_files(repo_path)
+    return repo_path
+
+
+@pytest.fixture(scope="session")
+def _base_git_repo_with_deletion(tmp_path_factory, _base_git_repo_with_changes):
+    repo_path = tmp_path_factory.mktemp("repo_deletion", numbered=False) / "repo"
+    _clone_tree(_base_git_repo_with_changes, repo_path)
+    _delete_util(repo_path)
+    return repo_path
+
+
+@pytest.fixture(scope="session")
+def _base_git_repo_with_rename(tmp_path_factory, _base_git_repo_with_changes):
+    repo_path = tmp_path_factory.mktemp("repo_rename", numbered=False) / "repo"
+    _clone_tree(_base_git_repo_with_changes, repo_path)
+    _rename_util(repo_path)
+    return repo_path
+
+
+@pytest.fixture
+def tmp_git_repo(tmp_path, _base_git_repo):
+    """Empty git repo with an initial commit."""
+    repo_path = tmp_path / "repo"
+    _clone_tree(_base_git_repo, repo_path)
+    return repo_path
+
+
+@pytest.fixture
+def tmp_git_repo_with_changes(tmp_path, _base_git_repo_with_changes):
+    """Repo with added files in a second commit."""
+    repo_path = tmp_path / "repo"
+    _clone_tree(_base_git_repo_with_changes, repo_path)
+    return repo_path
 
 
 @pytest.fixture
-def tmp_git_repo_with_deletion(tmp_git_repo_with_changes):
+def tmp_git_repo_with_deletion(tmp_path, _base_git_repo_with_deletion):
     """Repo where a file was deleted in the latest commit."""
-    repo = tmp_git_repo_with_changes
-    subprocess.run(
-        ["git", "rm", "src/util.py"], cwd=repo, check=True, capture_output=True
-    )
-    subprocess.run(
-        ["git", "commit", "-m", "Delete util.py"], cwd=repo, check=True, capture_output=True
-    )
-    return repo
+    repo_path = tmp_path / "repo"
+    _clone_tree(_base_git_repo_with_deletion, repo_path)
+    return repo_path
 
 
 @pytest.fixture
-def tmp_git_repo_with_rename(tmp_git_repo_with_changes):
+def tmp_git_repo_with_rename(tmp_path, _base_git_repo_with_rename):
     """Repo with a renamed file in the latest commit."""
-    repo = tmp_git_repo_with_changes
-    subprocess.run(
-        ["git", "mv", "src/util.py", "src/helpers.py"],
-        cwd=repo,
-        check=True,
-        capture_output=True,
-    )
-    subprocess.run(
-        ["git", "commit", "-m", "Rename util.py to helpers.py"],
-        cwd=repo,
-        check=True,
-        capture_output=True,
-    )
-    return repo
+    repo_path = tmp_path / "repo"
+    _clone_tree(_base_git_repo_with_rename, repo_path)
+    return repo_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def le_change_test_repo():
     """Points to the le-change-test repo (skips if not populated)."""
     path = "/Users/gatema/Desktop/drive/git/code/le-change-test"
     if not os.path.isdir(os.path.join(path, ".git")):
         pytest.skip("le-change-test repo not available")
     # Verify it has commits
-    result = subprocess.run(
-        ["git", "log", "--oneline", "-1"],
-        cwd=path,
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
+    if pygit2.Repository(path).head_is_unborn:
         pytest.skip("le-change-test repo has no commits")
     return path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def le_change_test_detector(le_change_test_repo):
+    """One ChangeDetector on the le-change-test repo, shared by the session."""
+    from lechange import ChangeDetector
+
+    return ChangeDetector(le_change_test_repo)
+
+
+@pytest.fixture(scope="session")
 def le_change_test_shas(le_change_test_repo):
     """Return dict of commit SHAs from le-change-test repo."""
-    result = subprocess.run(
-        ["git", "log", "--format=%H %s", "--reverse", "main"],
-        cwd=le_change_test_repo,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
+    repo = pygit2.Repository(le_change_test_repo)
+    main = repo.revparse_single("main")
+    walker = repo.walk(main.id, pygit2.enums.SortMode.TIME | pygit2.enums.SortMode.REVERSE)
     shas = {}
-    for i, line in enumerate(result.stdout.strip().split("\n")):
-        sha, msg = line.split(" ", 1)
+    for i, commit in enumerate(walker):
+        sha = str(commit.id)
         shas[f"commit{i + 1}"] = sha
-        shas[msg] = sha
+        shas[commit.message.split("\n", 1)[0]] = sha
     return shas
 
 
+def commit_file(repo_path, name, content, message):
+    """Write `name` in the working tree and commit it on HEAD."""
+    (repo_path / name).write_text(content)
+    repo = pygit2.Repository(str(repo_path))
+    repo.index.add(name)
+    _commit_index(repo, message)
+
+
 def get_head_sha(repo_path):
     """Get the HEAD SHA of a git repo."""
-    result = subprocess.run(
-        ["git", "rev-parse", "HEAD"],
-        cwd=repo_path,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    return result.stdout.strip()
+    return str(pygit2.Repository(str(repo_path)).head.target)
 
 
 def get_prev_sha(repo_path):
     """Get HEAD^ SHA of a git repo."""
-    result = subprocess.run(
-        ["git", "rev-parse", "HEAD~1"],
-        cwd=repo_path,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    return result.stdout.strip()
+    head = pygit2.Repository(str(repo_path)).head.peel(pygit2.Commit)
+    return str(head.parents[0].id)
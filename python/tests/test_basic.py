@@ -41,6 +41,29 @@ def test_config_with_parameters():
     assert config is not None
 
 
+def test_config_base_head_aliases():
+    """Test Config accepts base/head as keyword aliases."""
+    config = Config(base="main", head="HEAD", files=["**/*.py"])
+    assert config is not None
+
+
+def test_config_fields_are_readable():
+    """Test Config exposes its settings as read-only attributes."""
+    config = Config(base="main", head="HEAD", files=["**/*.py"], json=True, token="secret")
+    assert config.base_sha == "main"
+    assert config.sha == "HEAD"
+    assert config.files == ["**/*.py"]
+    assert config.json is True
+    assert not hasattr(config, "token")
+
+
+def test_config_is_frozen():
+    """Test Config attributes cannot be reassigned."""
+    config = Config(files=["**/*.py"])
+    with pytest.raises(AttributeError):
+        config.files = ["**/*.rs"]
+
+
 def test_detector_creation():
     """Test ChangeDetector creation."""
     detector = ChangeDetector(".")
@@ -1,24 +1,14 @@
 """Integration tests for ChangeDetector with real git repos."""
 
-import subprocess
+import asyncio
+import json
+import operator
+from concurrent.futures import ThreadPoolExecutor
+import pygit2
 import pytest
-from lechange import ChangeDetector, Config, PathError
+from lechange import ChangeDetector, ChangedFilesView, Config, GitError, PathError
 
-
-def get_head_sha(repo_path):
-    result = subprocess.run(
-        ["git", "rev-parse", "HEAD"],
-        cwd=repo_path, capture_output=True, text=True, check=True,
-    )
-    return result.stdout.strip()
-
-
-def get_prev_sha(repo_path):
-    result = subprocess.run(
-        ["git", "rev-parse", "HEAD~1"],
-        cwd=repo_path, capture_output=True, text=True, check=True,
-    )
-    return result.stdout.strip()
+from .conftest import commit_file, get_head_sha, get_prev_sha
 
 
 class TestDetectAddedFiles:
@@ -81,6 +71,99 @@ class TestNoChanges:
         result = detector.get_changed_files(config)
         assert len(list(result.all_changed_files)) == 0
 
+    def test_same_sha_needs_no_git_lookup(self, tmp_path):
+        # Identical SHAs short-circuit before the repository is even opened
+        detector = ChangeDetector(str(tmp_path))
+        sha = "0" * 40
+        result = detector.get_changed_files(Config(base_sha=sha, sha=sha, skip_same_sha=True))
+        assert result.any_changed is False
+        assert any(d["category"] == "skipped_same_sha" for d in result.diagnostics)
+
+    def test_same_sha_with_until_still_diffs(self, tmp_git_repo_with_changes):
+        # `until` takes priority over `sha`, so the range is prev..HEAD
+        repo = tmp_git_repo_with_changes
+        prev = get_prev_sha(repo)
+        detector = ChangeDetector(str(repo))
+        config = Config(base_sha=prev, sha=prev, until="2100-01-01", skip_same_sha=True)
+        result = detector.get_changed_files(config)
+        assert result.any_changed
+        assert not any(d["category"] == "skipped_same_sha" for d in result.diagnostics)
+
+    def test_same_invalid_sha_is_still_validated(self, tmp_git_repo):
+        detector = ChangeDetector(str(tmp_git_repo))
+        config = Config(base_sha="no-such-ref", sha="no-such-ref", skip_same_sha=True)
+        with pytest.raises(GitError):
+            detector.get_changed_files(config)
+        with pytest.raises(GitError):
+            detector.any_changed(config)
+        with pytest.raises(GitError):
+            asyncio.run(detector.get_changed_files_async(config))
+
+
+class TestConfigAliases:
+    def test_base_head_match_base_sha_sha(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        aliased = detector.get_changed_files(Config(base=base, head=head))
+        explicit = detector.get_changed_files(Config(base_sha=base, sha=head))
+        assert list(aliased.all_changed_files) == list(explicit.all_changed_files)
+
+
+class TestResolve:
+    def test_resolve_matches_rev_parse(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        assert detector.resolve("HEAD") == get_head_sha(repo)
+        assert detector.resolve("HEAD~1") == get_prev_sha(repo)
+        assert detector.resolve(get_head_sha(repo)) == get_head_sha(repo)
+
+    def test_commit_shas_match_rev_list(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        git_repo = pygit2.Repository(str(repo))
+        order = pygit2.enums.SortMode.TOPOLOGICAL | pygit2.enums.SortMode.REVERSE
+        expected = [str(commit.id) for commit in git_repo.walk(git_repo.head.target, order)]
+        assert detector.commit_shas() == expected
+        assert detector.commit_shas("HEAD~1") == expected[:-1]
+        with pytest.raises(GitError):
+            detector.commit_shas("no-such-branch")
+
+    def test_symbolic_revisions_in_config(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        symbolic = detector.get_changed_files(Config(base_sha="HEAD~1", sha="HEAD"))
+        explicit = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        assert list(symbolic.all_changed_files) == list(explicit.all_changed_files)
+
+    def test_unused_sha_is_not_resolved(self, tmp_git_repo_with_changes):
+        # `until` picks the head, so the core never reads `sha`
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        config = Config(base_sha="HEAD~1", sha="no-such-ref", until="2100-01-01")
+        result = detector.get_changed_files(config)
+        expected = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        assert list(result.all_changed_files) == list(expected.all_changed_files)
+
+    def test_refresh_rereads_moved_refs(self, tmp_git_repo):
+        repo = tmp_git_repo
+        detector = ChangeDetector(str(repo))
+        before = detector.resolve("HEAD")
+        commit_file(repo, "new.txt", "new\n", "new")
+        assert detector.resolve("HEAD") == before
+        detector.refresh()
+        assert detector.resolve("HEAD") == get_head_sha(repo) != before
+
+    def test_resolve_unknown_ref(self, tmp_git_repo):
+        detector = ChangeDetector(str(tmp_git_repo))
+        with pytest.raises(GitError):
+            detector.resolve("no-such-branch")
+
 
 class TestCounts:
     def test_counts_match_lists(self, tmp_git_repo_with_changes):
@@ -107,6 +190,17 @@ class TestBooleanChecks:
         assert result.any_changed is True
         assert result.any_added is True
 
+    def test_detector_any_changed(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        for files in (None, ["**/*.py"], ["**/*.nothing"]):
+            config = Config(base_sha=base, sha=head, files=files)
+            expected = detector.get_changed_files(config).any_changed
+            assert detector.any_changed(config) is expected
+        assert detector.any_changed(Config(base_sha=head, sha=head, skip_same_sha=True)) is False
+
 
 class TestDiagnostics:
     def test_diagnostics_accessible(self, tmp_git_repo):
@@ -132,6 +226,220 @@ class TestRenamedMapping:
         mapping = result.renamed_files_mapping
         assert isinstance(mapping, dict)
 
+    def test_old_new_renamed_files_match_mapping(self, tmp_git_repo_with_rename):
+        repo = tmp_git_repo_with_rename
+        detector = ChangeDetector(str(repo))
+        result = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        pairs = result.all_old_new_renamed_files
+        assert isinstance(pairs, ChangedFilesView)
+        assert dict(zip(pairs[::2], pairs[1::2])) == result.renamed_files_mapping
+
+
+class TestChangedFilesView:
+    def test_per_type_lists_are_views(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        result = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        added = result.added_files
+        assert isinstance(added, ChangedFilesView)
+        assert len(added) == result.added_files_count
+        assert list(added) == [added[i] for i in range(len(added))]
+        assert added[-1] == list(added)[-1]
+        assert added[:2] == list(added)[:2]
+        assert added[0] in added
+        assert added == list(added)
+        with pytest.raises(IndexError):
+            added[len(added)]
+
+    def test_view_equality_matches_list_semantics(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        result = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        added = result.added_files
+        assert added == result.added_files
+        assert added == list(added)
+        assert list(added) == added
+        # Like the list it replaces, a view never equals a tuple
+        assert added != tuple(added)
+        assert added.__eq__(tuple(added)) is NotImplemented
+        assert added.__eq__(object()) is NotImplemented
+
+    def test_aggregate_lists_are_views(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        result = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        all_changed = result.all_changed_files
+        assert isinstance(all_changed, ChangedFilesView)
+        assert isinstance(result.other_changed_files, ChangedFilesView)
+        assert len(all_changed) == result.all_changed_files_count
+        assert all_changed[:1] == list(all_changed)[:1]
+
+    def test_iterator_length_hint(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        result = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        it = iter(result.all_changed_files)
+        assert operator.length_hint(it) == result.all_changed_files_count
+        next(it)
+        assert operator.length_hint(it) == result.all_changed_files_count - 1
+        assert len(list(it)) == result.all_changed_files_count - 1
+
+    def test_buffer_and_offsets(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        result = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        added = result.added_files
+        buffer = added.buffer
+        offsets = added.offsets
+        assert len(offsets) == len(added) + 1
+        decoded = [
+            buffer[offsets[i]:offsets[i + 1]].decode() for i in range(len(added))
+        ]
+        assert decoded == list(added)
+
+
+class TestJson:
+    def test_all_changed_files_json(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        result = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        assert json.loads(result.all_changed_files_json()) == list(result.all_changed_files)
+
+    def test_all_changed_files_bytes(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        detector = ChangeDetector(str(repo))
+        result = detector.get_changed_files(
+            Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        )
+        paths = result.all_changed_files_bytes()
+        assert all(isinstance(path, bytes) for path in paths)
+        assert [path.decode() for path in paths] == list(result.all_changed_files)
+
+
+class TestBatch:
+    def test_batch_matches_single_calls(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        configs = [
+            Config(base_sha=base, sha=head),
+            Config(base_sha=base, sha=head, files=["**/*.py"]),
+        ]
+        results = detector.get_changed_files_batch(configs)
+        assert len(results) == 2
+        for config, result in zip(configs, results):
+            single = detector.get_changed_files(config)
+            assert list(result.all_changed_files) == list(single.all_changed_files)
+
+    def test_empty_batch(self, tmp_git_repo):
+        detector = ChangeDetector(str(tmp_git_repo))
+        assert detector.get_changed_files_batch([]) == []
+
+    def test_async_batch_matches_sync_batch(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        configs = [
+            Config(base_sha=base, sha=head),
+            Config(base_sha=base, sha=head, files=["**/*.py"]),
+        ]
+        results = asyncio.run(detector.get_changed_files_batch_async(configs))
+        expected = detector.get_changed_files_batch(configs)
+        assert [list(r.all_changed_files) for r in results] == [
+            list(r.all_changed_files) for r in expected
+        ]
+
+
+class TestMulti:
+    def test_multi_matches_single_calls(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        pattern_sets = [["**/*.py"], ["**/*.md"], (["**/*"], ["**/test_*.py"])]
+        results = detector.get_changed_files_multi(Config(base_sha=base, sha=head), pattern_sets)
+        assert len(results) == len(pattern_sets)
+        expected = [
+            Config(base_sha=base, sha=head, files=["**/*.py"]),
+            Config(base_sha=base, sha=head, files=["**/*.md"]),
+            Config(base_sha=base, sha=head, files=["**/*"], files_ignore=["**/test_*.py"]),
+        ]
+        for config, result in zip(expected, results):
+            single = detector.get_changed_files(config)
+            assert list(result.all_changed_files) == list(single.all_changed_files)
+
+
+class TestAsync:
+    async def test_async_matches_sync(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        config = Config(base_sha=base, sha=head)
+        result = await detector.get_changed_files_async(config)
+        expected = detector.get_changed_files(config)
+        assert list(result.all_changed_files) == list(expected.all_changed_files)
+
+    async def test_concurrent_awaits(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        results = await asyncio.gather(
+            *(detector.get_changed_files_async(Config(base_sha=base, sha=head)) for _ in range(4))
+        )
+        assert len({tuple(r.all_changed_files) for r in results}) == 1
+
+
+class TestThreads:
+    def test_concurrent_threads(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        config = Config(base_sha=get_prev_sha(repo), sha=get_head_sha(repo))
+        detector = ChangeDetector(str(repo))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: detector.get_changed_files(config), range(8)))
+        assert len({tuple(r.all_changed_files) for r in results}) == 1
+
+
+class TestDiffCache:
+    def test_repeated_calls_with_different_patterns(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        everything = detector.get_changed_files(Config(base_sha=base, sha=head))
+        python_only = detector.get_changed_files(
+            Config(base_sha=base, sha=head, files=["**/*.py"])
+        )
+        assert set(python_only.all_changed_files) <= set(everything.all_changed_files)
+        assert all(f.endswith(".py") for f in python_only.all_changed_files)
+
+    def test_clear_cache(self, tmp_git_repo_with_changes):
+        repo = tmp_git_repo_with_changes
+        base = get_prev_sha(repo)
+        head = get_head_sha(repo)
+        detector = ChangeDetector(str(repo))
+        config = Config(base_sha=base, sha=head)
+        first = list(detector.get_changed_files(config).all_changed_files)
+        detector.clear_cache()
+        assert list(detector.get_changed_files(config).all_changed_files) == first
+
 
 class TestRepr:
     def test_config_repr(self):
@@ -1,16 +1,9 @@
 """Tests for FileRecovery Python bindings."""
 
-import subprocess
 import pytest
 from lechange import FileRecovery, PathError, RecoveryError
 
-
-def get_head_sha(repo_path):
-    result = subprocess.run(
-        ["git", "rev-parse", "HEAD"],
-        cwd=repo_path, capture_output=True, text=True, check=True,
-    )
-    return result.stdout.strip()
+from .conftest import get_head_sha
 
 
 class TestConstruction:
@@ -34,7 +34,36 @@ class TestWriteJson:
         assert content == "[]"
 
 
+class TestWriteBatch:
+    def test_mixed_formats(self, tmp_path):
+        OutputWriter.write_batch(
+            str(tmp_path),
+            [
+                ("all", ["a.rs", "b.rs"], "txt"),
+                ("all", ["a.rs", "b.rs"], "json"),
+                ("deleted", [], "txt"),
+            ],
+            " ",
+        )
+        assert (tmp_path / "all.txt").read_text() == "a.rs b.rs"
+        assert (tmp_path / "all.json").read_text() == '["a.rs","b.rs"]'
+        assert (tmp_path / "deleted.txt").read_text() == ""
+
+    def test_default_separator(self, tmp_path):
+        OutputWriter.write_batch(str(tmp_path), [("files", ["a.rs", "b.rs"], "txt")])
+        assert (tmp_path / "files.txt").read_text() == "a.rs\nb.rs"
+
+    def test_unknown_extension(self, tmp_path):
+        with pytest.raises(ValueError):
+            OutputWriter.write_batch(str(tmp_path), [("files", ["a.rs"], "csv")])
+        assert not os.listdir(tmp_path)
+
+
 class TestErrors:
     def test_invalid_directory(self):
         with pytest.raises(OSError):
             OutputWriter.write_text("/nonexistent/path/xyz", "files", ["a"], "\n")
+
+    def test_batch_invalid_directory(self):
+        with pytest.raises(OSError):
+            OutputWriter.write_batch("/nonexistent/path/xyz", [("files", ["a"], "json")])
@@ -33,6 +33,14 @@ class TestPatternMatcherConstruction:
         with pytest.raises(ConfigError):
             PatternMatcher(includes=["[invalid"])
 
+    def test_repeated_construction_after_clear_cache(self):
+        first = PatternMatcher(includes=["**/*.py"], excludes=["**/test_*"])
+        PatternMatcher.clear_cache()
+        second = PatternMatcher(includes=["**/*.py"], excludes=["**/test_*"])
+        for m in (first, second):
+            assert m.matches("src/main.py")
+            assert not m.matches("tests/test_main.py")
+
 
 class TestPatternMatcherMatches:
     def test_match(self):
@@ -71,6 +79,11 @@ class TestPatternMatcherFilter:
         result = m.filter(["a.rs", "b.go"])
         assert result == []
 
+    def test_large_batch(self):
+        m = PatternMatcher(includes=["**/*.py"])
+        paths = [f"pkg/mod_{i}.{'py' if i % 3 == 0 else 'rs'}" for i in range(1000)]
+        assert m.filter(paths) == [p for p in paths if p.endswith(".py")]
+
 
 class TestPatternMatcherPartition:
     def test_basic_partition(self):
@@ -91,6 +104,13 @@ class TestPatternMatcherPartition:
         assert matched == []
         assert unmatched == ["a.rs", "b.go"]
 
+    def test_large_batch(self):
+        m = PatternMatcher(includes=["**/*.py"])
+        paths = [f"pkg/mod_{i}.{'py' if i % 3 == 0 else 'rs'}" for i in range(1000)]
+        matched, unmatched = m.partition(paths)
+        assert matched == [p for p in paths if p.endswith(".py")]
+        assert unmatched == [p for p in paths if p.endswith(".rs")]
+
 
 def test_repr():
     m = PatternMatcher(includes=["**/*.py"])
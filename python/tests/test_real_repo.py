@@ -1,15 +1,15 @@
 """Tests using the real le-change-test repo."""
 
 import pytest
-from lechange import ChangeDetector, Config
+from lechange import Config
 
 pytestmark = pytest.mark.real_repo
 
 
 class TestDetectAllChanges:
-    def test_detect_all_changes(self, le_change_test_repo, le_change_test_shas):
+    def test_detect_all_changes(self, le_change_test_detector, le_change_test_shas):
         """Compare first..last commit, verify multiple change types."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit1"],
             sha=le_change_test_shas["commit5"],
@@ -22,9 +22,9 @@ class TestDetectAllChanges:
 
 
 class TestDetectAdditionsOnly:
-    def test_additions_commit1_to_2(self, le_change_test_repo, le_change_test_shas):
+    def test_additions_commit1_to_2(self, le_change_test_detector, le_change_test_shas):
         """Commit 1→2 should only add files."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit1"],
             sha=le_change_test_shas["commit2"],
@@ -39,9 +39,9 @@ class TestDetectAdditionsOnly:
 
 
 class TestDetectRenames:
-    def test_renames_commit2_to_3(self, le_change_test_repo, le_change_test_shas):
+    def test_renames_commit2_to_3(self, le_change_test_detector, le_change_test_shas):
         """Commit 2→3 renames routes.ts to router.ts."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit2"],
             sha=le_change_test_shas["commit3"],
@@ -53,9 +53,9 @@ class TestDetectRenames:
 
 
 class TestDetectDeletions:
-    def test_deletions_commit3_to_4(self, le_change_test_repo, le_change_test_shas):
+    def test_deletions_commit3_to_4(self, le_change_test_detector, le_change_test_shas):
         """Commit 3→4 deletes docs/README.md and src/utils/validators.ts."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit3"],
             sha=le_change_test_shas["commit4"],
@@ -67,9 +67,9 @@ class TestDetectDeletions:
 
 
 class TestPatternFilterTsx:
-    def test_filter_tsx(self, le_change_test_repo, le_change_test_shas):
+    def test_filter_tsx(self, le_change_test_detector, le_change_test_shas):
         """Filter for *.tsx files only."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit1"],
             sha=le_change_test_shas["commit5"],
@@ -81,7 +81,7 @@ class TestPatternFilterTsx:
 
 
 class TestPatternFilterYamlGroups:
-    def test_yaml_groups(self, le_change_test_repo, le_change_test_shas):
+    def test_yaml_groups(self, le_change_test_detector, le_change_test_shas):
         """Use YAML groups for frontend/backend."""
         yaml = """
 frontend:
@@ -89,7 +89,7 @@ frontend:
 backend:
   - "src/api/**"
 """
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit1"],
             sha=le_change_test_shas["commit5"],
@@ -102,9 +102,9 @@ backend:
 
 
 class TestDirNames:
-    def test_dir_names(self, le_change_test_repo, le_change_test_shas):
+    def test_dir_names(self, le_change_test_detector, le_change_test_shas):
         """Config dir_names=True extracts directory names."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit1"],
             sha=le_change_test_shas["commit5"],
@@ -117,9 +117,9 @@ class TestDirNames:
 
 
 class TestRenameSplitting:
-    def test_rename_as_delete_add(self, le_change_test_repo, le_change_test_shas):
+    def test_rename_as_delete_add(self, le_change_test_detector, le_change_test_shas):
         """Config output_renamed_as_deleted_added=True splits renames."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit2"],
             sha=le_change_test_shas["commit3"],
@@ -132,9 +132,9 @@ class TestRenameSplitting:
 
 
 class TestCountsConsistent:
-    def test_counts_consistent(self, le_change_test_repo, le_change_test_shas):
+    def test_counts_consistent(self, le_change_test_detector, le_change_test_shas):
         """Per-type counts should be consistent."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit1"],
             sha=le_change_test_shas["commit5"],
@@ -147,14 +147,14 @@ class TestCountsConsistent:
 
 
 class TestPosixPaths:
-    def test_posix_paths(self, le_change_test_repo, le_change_test_shas):
+    def test_posix_paths(self, le_change_test_detector, le_change_test_shas):
         """Config use_posix_path_separator=True produces forward slashes."""
-        detector = ChangeDetector(le_change_test_repo)
+        detector = le_change_test_detector
         config = Config(
             base_sha=le_change_test_shas["commit1"],
             sha=le_change_test_shas["commit5"],
             use_posix_path_separator=True,
         )
         result = detector.get_changed_files(config)
-        for f in result.all_changed_files:
-            assert "\\" not in f, f"Expected POSIX path, got {f}"
+        for f in result.all_changed_files_bytes():
+            assert b"\\" not in f, f"Expected POSIX path, got {f!r}"
@@ -30,28 +30,27 @@ def _check_prerequisites():
     skip_if_no_repo()
 
 
-@pytest.fixture
-def shas():
-    """Get commit SHAs from test repo."""
-    import subprocess
-
-    result = subprocess.run(
-        ["git", "log", "--format=%H %s", "--reverse", "main"],
-        cwd=TEST_REPO_PATH,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    sha_map = {}
-    for i, line in enumerate(result.stdout.strip().split("\n")):
-        sha, msg = line.split(" ", 1)
-        sha_map[f"commit{i + 1}"] = sha
-    return sha_map
+@pytest.fixture(scope="session")
+def detector():
+    """One ChangeDetector shared by every test; configs stay per-test."""
+    # Session fixtures are set up before the autouse check above runs
+    skip_if_no_token()
+    skip_if_no_repo()
+
+    return ChangeDetector(TEST_REPO_PATH)
+
+
+@pytest.fixture(scope="session")
+def shas(detector):
+    """Get commit SHAs from test repo, walked once per session."""
+    return {
+        f"commit{i + 1}": sha
+        for i, sha in enumerate(detector.commit_shas("main"))
+    }
 
 
 class TestWorkflowTracking:
-    def test_detect_with_workflow_tracking(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_detect_with_workflow_tracking(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -66,8 +65,7 @@ class TestWorkflowTracking:
         rebuild = list(result.files_to_rebuild)
         assert isinstance(rebuild, list)
 
-    def test_workflow_rebuild_reasons(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_workflow_rebuild_reasons(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -85,8 +83,7 @@ class TestWorkflowTracking:
             assert "kind" in r
             assert "failed_run_id" in r
 
-    def test_workflow_failed_jobs(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_workflow_failed_jobs(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -100,8 +97,7 @@ class TestWorkflowTracking:
         jobs = list(result.failed_jobs)
         assert isinstance(jobs, list)
 
-    def test_workflow_successful_jobs(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_workflow_successful_jobs(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -115,8 +111,7 @@ class TestWorkflowTracking:
         jobs = list(result.successful_jobs)
         assert isinstance(jobs, list)
 
-    def test_workflow_files_to_skip(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_workflow_files_to_skip(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -131,8 +126,7 @@ class TestWorkflowTracking:
         skip = list(result.files_to_skip)
         assert isinstance(skip, list)
 
-    def test_workflow_disjoint_invariant(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_workflow_disjoint_invariant(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -148,8 +142,7 @@ class TestWorkflowTracking:
         skip = set(result.files_to_skip)
         assert rebuild.isdisjoint(skip), f"Overlap: {rebuild & skip}"
 
-    def test_workflow_no_wait(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_workflow_no_wait(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -161,8 +154,7 @@ class TestWorkflowTracking:
         result = detector.get_changed_files(config)
         assert result.any_changed
 
-    def test_workflow_short_timeout(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_workflow_short_timeout(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -175,8 +167,7 @@ class TestWorkflowTracking:
         result = detector.get_changed_files(config)
         assert isinstance(list(result.files_to_rebuild), list)
 
-    def test_workflow_name_filter(self, shas):
-        detector = ChangeDetector(TEST_REPO_PATH)
+    def test_workflow_name_filter(self, detector, shas):
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],
@@ -192,9 +183,8 @@ class TestWorkflowTracking:
 
 
 class TestWorkflowWithoutToken:
-    def test_without_token(self, shas):
+    def test_without_token(self, detector, shas):
         pytest.importorskip("lechange")
-        detector = ChangeDetector(TEST_REPO_PATH)
         config = Config(
             base_sha=shas["commit1"],
             sha=shas["commit5"],